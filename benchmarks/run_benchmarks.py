@@ -0,0 +1,206 @@
+"""
+Benchmarks of the delivery network functions. To be ran from the root folder :
+
+    python benchmarks/run_benchmarks.py                     # full run
+    python benchmarks/run_benchmarks.py --quick             # smaller samples and sizes
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/<old>.json
+
+For each input/network.x.in (with routes.x.in and trucks.x.in, or trucks.0.in), and for synthetic
+graphs of growing size (generated by delivery_network/generator.py), every function is timed (best of --repeat runs), its throughput is given
+in operations per second and its peak memory is measured with tracemalloc (in a separate run, the
+tracing slowing down the code). The scaling exponent of each function on the synthetic graphs
+is the slope of log(time) against log(size). The results are saved as JSON in benchmarks/results
+so that two commits can be compared.
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append("delivery_network")
+
+from generator import generate_network
+from graph import (Graph, graph_from_file, route_from_file, truck_from_file, kruskal, min_power_for_path,
+                   MinPowerTree, TruckCatalogue, greedy_knapsack, knapsack, wrapper)
+
+
+def measure(func, repeat=1, memory=True):
+    """
+    Returns (seconds, peak memory in MB, result of func()) ; seconds is the best of repeat runs.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds = min(seconds, time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return seconds, peak, result
+
+
+class Recorder:
+    """Runs the benchmarks and keeps their results"""
+
+    def __init__(self, repeat, memory):
+        self.repeat = repeat
+        self.memory = memory
+        self.results = []
+
+    def run(self, name, dataset, size, operations, func):
+        seconds, peak, result = measure(func, self.repeat, self.memory)
+        self.results.append({"name": name, "dataset": dataset, "size": size, "operations": operations,
+                             "seconds": seconds, "throughput": operations / seconds if seconds > 0 else None,
+                             "peak_memory_mb": peak})
+        print("{:<28} {:<18} {:>9} ops {:>10.4f} s {:>12} ops/s {:>9} MB".format(
+            name, dataset, operations, seconds,
+            "{:.0f}".format(operations / seconds) if seconds > 0 else "-",
+            "{:.1f}".format(peak) if peak is not None else "-"))
+        return result
+
+
+def bench_inputs(recorder, sample, knapsack_time):
+    """Benchmarks on the files of the input folder"""
+    x = 1
+    while os.path.exists("input/network.{}.in".format(x)):
+        network, routes_file = "input/network.{}.in".format(x), "input/routes.{}.in".format(x)
+        trucks_file = "input/trucks.{}.in".format(x)
+        if not os.path.exists(trucks_file):
+            trucks_file = "input/trucks.0.in"
+        dataset = "network.{}".format(x)
+
+        g = recorder.run("graph_from_file", dataset, 1, 1, lambda: graph_from_file(network))
+        mst = recorder.run("kruskal", dataset, g.nb_edges, g.nb_edges, lambda: kruskal(g))
+        if not os.path.exists(routes_file):
+            x += 1
+            continue
+        routes = recorder.run("route_from_file", dataset, 1, 1, lambda: route_from_file(routes_file))
+        trucks = truck_from_file(trucks_file)
+        some_routes = random.Random(x).sample(routes, min(sample, len(routes)))
+
+        recorder.run("Graph.min_power", dataset, g.nb_nodes, len(some_routes),
+                     lambda: [g.min_power(src, dest) for src, dest, _ in some_routes])
+        recorder.run("min_power_for_path", dataset, g.nb_nodes, len(some_routes),
+                     lambda: [min_power_for_path(mst, src, dest) for src, dest, _ in some_routes])
+        tree = recorder.run("MinPowerTree", dataset, g.nb_nodes, 1, lambda: MinPowerTree(mst))
+        min_powers = recorder.run("MinPowerTree.query_many", dataset, g.nb_nodes, len(routes), lambda: tree.query_many(routes))
+
+        roads = [(src, dest, profit, power) for (src, dest, profit), power in zip(routes, min_powers.tolist())]
+        recorder.run("greedy_knapsack", dataset, len(routes), len(routes), lambda: greedy_knapsack(trucks, roads))
+        catalogue = TruckCatalogue(trucks)
+        items = [[catalogue.trucks[truck][1], road[2]]
+                 for road, truck in zip(routes, catalogue.cheapest_trucks_for(min_powers).tolist()) if truck != -1]
+        recorder.run("knapsack", dataset, len(items), len(items), lambda: knapsack(25*(10**9), items, max_time=knapsack_time))
+
+        with tempfile.NamedTemporaryFile("w", suffix=".in", delete=False) as file: #wrapper on a sample of the routes
+            file.write("{}\n".format(len(some_routes)) + "".join("{} {} {}\n".format(*road) for road in some_routes))
+        recorder.run("wrapper", dataset, len(some_routes), len(some_routes), lambda: wrapper(g, file.name, trucks_file))
+        os.remove(file.name)
+        x += 1
+
+
+def random_graph(n, seed):
+    """A connected random graph : a random tree plus n random edges (see generator)"""
+    g = Graph(range(1, n+1))
+    for node1, node2, power_min, dist in generate_network(n, 2 * n, "tree", seed=seed).tolist():
+        g.add_edge(node1, node2, power_min, dist)
+    return g
+
+
+def bench_synthetic(recorder, sizes, sample):
+    """Benchmarks on random graphs of growing size"""
+    for n in sizes:
+        dataset = "synthetic.{}".format(n)
+        g = random_graph(n, n)
+        rng = random.Random(n)
+        routes = [(rng.randint(1, n), rng.randint(1, n)) for _ in range(10 * n)]
+        mst = recorder.run("kruskal", dataset, n, g.nb_edges, lambda: kruskal(g))
+        recorder.run("Graph.min_power", dataset, n, sample, lambda: [g.min_power(src, dest) for src, dest in routes[:sample]])
+        recorder.run("min_power_for_path", dataset, n, sample,
+                     lambda: [min_power_for_path(mst, src, dest) for src, dest in routes[:sample]])
+        tree = recorder.run("MinPowerTree", dataset, n, 1, lambda: MinPowerTree(mst))
+        recorder.run("MinPowerTree.query_many", dataset, n, len(routes), lambda: tree.query_many(routes))
+
+
+def scaling(results):
+    """Slope of log(seconds per operation) against log(size) for each function on the synthetic graphs"""
+    curves = {}
+    for result in results:
+        if result["dataset"].startswith("synthetic") and result["seconds"] > 0:
+            curves.setdefault(result["name"], []).append((result["size"], result["seconds"] / result["operations"]))
+    slopes = {}
+    for name, points in curves.items():
+        if len(points) >= 2:
+            xs = [math.log(size) for size, _ in points]
+            ys = [math.log(seconds) for _, seconds in points]
+            mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+            slopes[name] = sum((a - mean_x) * (b - mean_y) for a, b in zip(xs, ys)) / sum((a - mean_x) ** 2 for a in xs)
+    return {name: {"points": curves[name], "exponent": slope} for name, slope in slopes.items()}
+
+
+def compare(results, filename):
+    """Prints the ratio new time / old time for the benchmarks present in both runs"""
+    with open(filename, "r") as file:
+        old = dict(((r["name"], r["dataset"]), r) for r in json.load(file)["results"])
+    print("\nComparison with {} (new time / old time) :".format(filename))
+    for result in results:
+        previous = old.get((result["name"], result["dataset"]))
+        if previous and previous["seconds"] > 0:
+            ratio = result["seconds"] / previous["seconds"]
+            print("{:<28} {:<18} {:>7.2f}{}".format(result["name"], result["dataset"], ratio, "  <-- slower" if ratio > 1.2 else ""))
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the delivery network functions")
+    parser.add_argument("--quick", action="store_true", help="smaller samples and synthetic sizes")
+    parser.add_argument("--repeat", type=int, default=1, help="number of timed runs (the best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="do not measure the peak memory")
+    parser.add_argument("--skip-inputs", action="store_true", help="only the synthetic graphs")
+    parser.add_argument("--skip-synthetic", action="store_true", help="only the files of the input folder")
+    parser.add_argument("--output", help="JSON file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="a previous JSON file to compare with")
+    args = parser.parse_args()
+
+    sample = 5 if args.quick else 20
+    sizes = [1000, 10000] if args.quick else [1000, 10000, 100000]
+    recorder = Recorder(args.repeat, not args.no_memory)
+    if not args.skip_inputs:
+        bench_inputs(recorder, sample, knapsack_time=5 if args.quick else 60)
+    if not args.skip_synthetic:
+        bench_synthetic(recorder, sizes, sample)
+
+    report = {"commit": git_commit(), "date": datetime.datetime.now().isoformat(timespec="seconds"),
+              "python": platform.python_version(), "machine": platform.platform(),
+              "results": recorder.results, "scaling": scaling(recorder.results)}
+    for name, curve in report["scaling"].items():
+        print("scaling of {:<28} time per operation ~ size^{:.2f}".format(name, curve["exponent"]))
+
+    output = args.output or os.path.join("benchmarks", "results", "{}.json".format(report["commit"]))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print("results saved in {}".format(output))
+    if args.compare:
+        compare(recorder.results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
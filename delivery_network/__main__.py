@@ -0,0 +1,186 @@
+"""
+Command line interface, to be ran from the root folder :
+
+    python -m delivery_network solve-routes input/network.2.in input/routes.2.in
+    python -m delivery_network min-power input/network.1.in 5 4
+    python -m delivery_network shortest-path input/network.1.in 5 4 --power 10000
+    python -m delivery_network shortest-path input/network.1.in 5 4 --pareto
+    python -m delivery_network assign input/network.1.in input/routes.1.in input/trucks.1.in --method dp
+    python -m delivery_network view input/network.1.in 1 3
+    python -m delivery_network view input/network.2.in 37816 77493 -k 1
+    python -m delivery_network generate input 11 1000000 --routes 1000000 --topology geometric
+    python -m delivery_network --stats stats.json --memory assign input/network.1.in input/routes.1.in input/trucks.1.in
+    python -m delivery_network --profile assign.prof assign input/network.1.in input/routes.1.in input/trucks.1.in
+
+Each subcommand only imports the modules it needs. --stats writes the time and the peak memory of
+the stages and the counters of the solvers in a JSON file (see instrumentation), --profile runs
+the command under cProfile.
+"""
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def solve_routes_command(args):
+    from pipeline import solve_routes
+    output = args.output or os.path.basename(args.routes_file).replace(".in", ".out")
+    nb_routes = solve_routes(args.network_file, args.routes_file, output, args.workers, args.chunk_size, args.cache)
+    print("{} routes written in {}".format(nb_routes, output))
+
+
+def min_power_command(args):
+    from graph import kruskal, min_power_for_path
+    from loader import graph_from_file
+    try:
+        min_power, path, _ = min_power_for_path(kruskal(graph_from_file(args.network_file, args.cache)),
+                                                args.src, args.dest, return_path=True)
+    except KeyError as error:
+        sys.exit("unknown node: {}".format(error))
+    except ValueError as error: #the two nodes are not connected
+        sys.exit("no path between {} and {}: {}".format(args.src, args.dest, error))
+    print(min_power)
+    print(" ".join(map(str, path)))
+
+
+def shortest_path_command(args):
+    from loader import graph_from_file
+    g = graph_from_file(args.network_file, args.cache)
+    if args.pareto:
+        frontier, complete = g.pareto_routes(args.src, args.dest, args.max_points, args.max_time)
+        for power, dist, path in frontier:
+            print("power >= {} : {} ({})".format(power, dist, " ".join(map(str, path))))
+        if not complete:
+            print("(stopped by a limit : the points of smallest power are missing)")
+        return
+    result = g.shortest_path_with_power(args.src, args.dest, args.power)
+    if result is None:
+        print("no path with power {:g}".format(args.power))
+        return
+    path, dist = result
+    print(dist)
+    print(" ".join(map(str, path)))
+
+
+def assign_command(args):
+    from loader import graph_from_file
+    from solvers import assign_trucks_to_routes, wrapper
+    g = graph_from_file(args.network_file, args.cache)
+    if args.method == "greedy":
+        print(assign_trucks_to_routes(g, args.routes_file, args.trucks_file, args.budget))
+    else:
+        print(wrapper(g, args.routes_file, args.trucks_file, args.method, budget=args.budget,
+                      max_nodes=args.max_nodes, max_time=args.max_time))
+
+
+def view_command(args):
+    from loader import graph_from_file
+    from visualization import OUTPUT_DIRECTORY, view, view_mst, view_route, write_dot
+    g = graph_from_file(args.network_file)
+    route = args.node1 is not None and args.node2 is not None
+    if args.mst:
+        nodes = args.nodes or [node for node in (args.node1, args.node2) if node is not None]
+        print(view_mst(g, nodes, args.k or 0, show=not args.no_render))
+    elif route and args.k is not None:
+        print(view_route(g, args.node1, args.node2, args.k, show=not args.no_render))
+    elif args.no_render:
+        path = g.min_power(args.node1, args.node2)[0] if route else None
+        print(write_dot(g, os.path.join(OUTPUT_DIRECTORY, "Graph.gv"), path=path))
+    else:
+        view(g, args.node1, args.node2)
+
+
+def generate_command(args):
+    from generator import generate_files
+    filenames = generate_files(args.folder, args.x, args.nodes, args.edges, args.routes, args.trucks,
+                               args.topology, args.power, args.max_power, args.seed)
+    print("written: {}".format(", ".join(filenames)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m delivery_network")
+    parser.add_argument("--stats", metavar="FILE", help="write the timers and the counters of the solvers in a JSON file")
+    parser.add_argument("--memory", action="store_true", help="with --stats, also record the peak memory of each stage (slower)")
+    parser.add_argument("--profile", metavar="FILE", help="run the command under cProfile (report in FILE.txt)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve = commands.add_parser("solve-routes", help="write the minimal power of each route in a routes.x.out file")
+    solve.add_argument("network_file")
+    solve.add_argument("routes_file")
+    solve.add_argument("-o", "--output", help="output file (default: routes.x.out in the current folder)")
+    solve.add_argument("-w", "--workers", type=int, default=None, help="number of processes (default: number of cores)")
+    solve.add_argument("--chunk-size", type=int, default=10000, help="number of routes per task")
+    solve.add_argument("--cache", action="store_true", help="use the .npz cache of the input files")
+    solve.set_defaults(run=solve_routes_command)
+
+    power = commands.add_parser("min-power", help="print the minimal power and the path of a traject")
+    power.add_argument("network_file")
+    power.add_argument("src", type=int)
+    power.add_argument("dest", type=int)
+    power.add_argument("--cache", action="store_true", help="use the .npz cache of the input files")
+    power.set_defaults(run=min_power_command)
+
+    shortest = commands.add_parser("shortest-path", help="print the length and the shortest path of a traject for a truck power")
+    shortest.add_argument("network_file")
+    shortest.add_argument("src", type=int)
+    shortest.add_argument("dest", type=int)
+    shortest.add_argument("--power", type=float, default=float("inf"), help="power of the truck (default: no limit)")
+    shortest.add_argument("--pareto", action="store_true", help="print the shortest distance for each power threshold")
+    shortest.add_argument("--max-points", type=int, default=None, help="with --pareto, maximal number of thresholds")
+    shortest.add_argument("--max-time", type=float, default=None, help="with --pareto, time limit in seconds")
+    shortest.add_argument("--cache", action="store_true", help="use the .npz cache of the input files")
+    shortest.set_defaults(run=shortest_path_command)
+
+    assign = commands.add_parser("assign", help="choose the trucks to buy for the routes within the budget")
+    assign.add_argument("network_file")
+    assign.add_argument("routes_file")
+    assign.add_argument("trucks_file")
+    assign.add_argument("--method", choices=["greedy", "branch_and_bound", "dp"], default="greedy")
+    assign.add_argument("--budget", type=int, default=25*(10**9), help="total budget for the trucks")
+    assign.add_argument("--max-nodes", type=int, default=None, help="with branch_and_bound, maximal number of nodes expanded")
+    assign.add_argument("--max-time", type=float, default=None, help="with branch_and_bound, time limit in seconds")
+    assign.add_argument("--cache", action="store_true", help="use the .npz cache of the input files")
+    assign.set_defaults(run=assign_command)
+
+    view = commands.add_parser("view", help="draw the graph with graphviz (and the minimal power path between two nodes)")
+    view.add_argument("network_file")
+    view.add_argument("node1", type=int, nargs="?")
+    view.add_argument("node2", type=int, nargs="?")
+    view.add_argument("-k", type=int, default=None, help="only draw the path and the nodes at most k edges away")
+    view.add_argument("--mst", action="store_true", help="draw the minimum spanning tree restricted to the nodes")
+    view.add_argument("--nodes", type=int, nargs="+", help="the nodes drawn with --mst")
+    view.add_argument("--no-render", action="store_true", help="only write the DOT file (no graphviz needed)")
+    view.set_defaults(run=view_command)
+
+    generate = commands.add_parser("generate", help="write random network.x.in, routes.x.in and trucks.x.in files")
+    generate.add_argument("folder")
+    generate.add_argument("x", help="the number of the files")
+    generate.add_argument("nodes", type=int, help="number of nodes")
+    generate.add_argument("--edges", type=int, default=None, help="number of edges (default: number of nodes)")
+    generate.add_argument("--routes", type=int, default=100000, help="number of routes")
+    generate.add_argument("--trucks", type=int, default=100, help="number of trucks")
+    generate.add_argument("--topology", choices=["tree", "grid", "geometric"], default="tree")
+    generate.add_argument("--power", choices=["uniform", "lognormal", "distance"], default="uniform")
+    generate.add_argument("--max-power", type=int, default=10**6)
+    generate.add_argument("--seed", type=int, default=None)
+    generate.set_defaults(run=generate_command)
+
+    args = parser.parse_args(argv)
+    import instrumentation
+    if args.stats:
+        instrumentation.enable(args.memory)
+    try:
+        if args.profile:
+            with instrumentation.profile(args.profile):
+                args.run(args)
+        else:
+            args.run(args)
+    finally:
+        if args.stats:
+            instrumentation.disable()
+            instrumentation.export_json(args.stats)
+            print("statistics written in {}".format(args.stats))
+
+
+if __name__ == "__main__":
+    main()
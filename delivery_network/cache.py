@@ -0,0 +1,231 @@
+"""
+A cache in front of the minimal power functions.
+
+The same trajects come back in many routes files : MinPowerCache keeps the last answers in memory
+(LRU, bounded size) and, optionally, in a SQLite file shared by the batch jobs. The answers of the
+file are stored with the hash (sha256) of the content of the network file, so that they are not
+used any more as soon as the network changes. The trajects are not oriented : (a, b) and (b, a)
+are the same key.
+
+    cache = MinPowerCache.from_file("input/network.2.in", store="min_power.sqlite")
+    cache.query(37816, 77493)
+    cache.stats()
+
+Any function (src, dest) -> power can be cached, e.g. MinPowerCache(lambda a, b: g.min_power(a, b)[1]).
+"""
+import collections
+import hashlib
+import sqlite3
+from lazy import lazy_import
+from graph import MinPowerTree, kruskal
+from loader import csr_graph_from_file
+
+np = lazy_import("numpy")
+
+
+def network_hash(filename):
+    """Returns the sha256 of the content of a file (hexadecimal string)"""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MinPowerStore:
+    """
+    Answers saved in a SQLite file : one table min_power(network, src, dest, power), where network
+    is the hash of the network file and src <= dest. power is NULL for a traject between two
+    connected components. The writes are grouped (flush every batch_size answers, or at close).
+    """
+
+    def __init__(self, filename, network, batch_size=10000):
+        self.network = network
+        self.batch_size = batch_size
+        self._pending = []
+        self._db = sqlite3.connect(filename)
+        self._db.execute("CREATE TABLE IF NOT EXISTS min_power (network TEXT, src INTEGER, dest INTEGER, power, "
+                         "PRIMARY KEY (network, src, dest)) WITHOUT ROWID")
+
+    def get(self, key):
+        """Returns (True, power) if the answer of key is saved, (False, None) otherwise"""
+        row = self._db.execute("SELECT power FROM min_power WHERE network = ? AND src = ? AND dest = ?",
+                               (self.network,) + key).fetchone()
+        return (False, None) if row is None else (True, row[0])
+
+    def put(self, key, power):
+        self._pending.append((self.network,) + key + (power,))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO min_power VALUES (?, ?, ?, ?)", self._pending)
+            self._pending = []
+
+    def purge(self):
+        """Deletes the answers of the other networks (older versions of the file)"""
+        self.flush()
+        with self._db:
+            self._db.execute("DELETE FROM min_power WHERE network != ?", (self.network,))
+
+    def close(self):
+        self.flush()
+        self._db.close()
+
+
+class MinPowerCache:
+    """
+    LRU cache of the minimal power of the trajects, with an optional MinPowerStore behind it.
+
+    Attributes:
+    -----------
+    max_size: int
+        The maximal number of answers kept in memory
+    hits, store_hits, misses: int
+        The number of queries answered from the memory, from the store, and computed
+    """
+
+    def __init__(self, query, max_size=100000, store=None, query_many=None):
+        """
+        Parameters:
+        -----------
+        query: function
+            query(src, dest) returns the minimal power, or raises ValueError if the nodes are not connected
+        max_size: int, optional
+            The maximal number of answers kept in memory. Default is 100000.
+        store: MinPowerStore, optional
+            The on-disk store. Default is None (memory only).
+        query_many: function, optional
+            A vectorized version of query (array of pairs -> array of powers), used by query_many
+        """
+        self._query = query
+        self._query_many = query_many
+        self.max_size = max_size
+        self.store = store
+        self._lru = collections.OrderedDict()
+        self.hits = self.store_hits = self.misses = 0
+
+    @classmethod
+    def from_file(cls, network_file, store=None, max_size=100000):
+        """
+        Cache of the minimal power on a network file. The MinPowerTree of the network is only built
+        at the first query which is neither in memory nor in the store.
+
+        Parameters:
+        -----------
+        network_file: str
+            A network.x.in file
+        store: str, optional
+            A SQLite file to read and save the answers. Default is None.
+        max_size: int, optional
+            The maximal number of answers kept in memory. Default is 100000.
+        """
+        tree = []
+        def get_tree():
+            if not tree:
+                tree.append(MinPowerTree(kruskal(csr_graph_from_file(network_file))))
+            return tree[0]
+        if store is not None:
+            store = MinPowerStore(store, network_hash(network_file))
+        return cls(lambda src, dest: get_tree().query(src, dest), max_size, store,
+                   lambda pairs: get_tree().query_many(pairs))
+
+    def _lookup(self, key):
+        """Returns (True, power) if the answer is in memory or in the store"""
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return True, self._lru[key]
+        if self.store is not None:
+            found, power = self.store.get(key)
+            if found:
+                self.store_hits += 1
+                self._remember(key, power, save=False)
+                return True, power
+        return False, None
+
+    def _remember(self, key, power, save=True):
+        self._lru[key] = power
+        if len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+        if save and self.store is not None:
+            self.store.put(key, power)
+
+    @staticmethod
+    def _answer(power):
+        if power is None:
+            raise ValueError("The two given nodes are not in the same connected component.")
+        return power
+
+    def query(self, src, dest):
+        """
+        Returns the minimal power to travel the traject between src and dest.
+        Raises ValueError if the two nodes are not connected (this answer is cached too).
+        """
+        src, dest = int(src), int(dest) #the nodes are the integers 1..n
+        key = (src, dest) if src <= dest else (dest, src)
+        found, power = self._lookup(key)
+        if not found:
+            self.misses += 1
+            try:
+                power = self._query(*key)
+            except ValueError:
+                power = None
+            power = power.item() if hasattr(power, "item") else power
+            self._remember(key, power)
+        return self._answer(power)
+
+    def query_many(self, pairs):
+        """
+        Returns the list of the minimal powers of the trajects of pairs (a list or array of
+        (src, dest, ...)) ; None for a traject between two connected components.
+        The trajects not in the cache are computed together with query_many if it was given.
+        """
+        if len(pairs) == 0:
+            return []
+        pairs = np.asarray(pairs, dtype=np.int64)[:, :2]
+        keys = list(zip(pairs.min(axis=1).tolist(), pairs.max(axis=1).tolist()))
+        answers = [None] * len(keys)
+        missing = []
+        for i, key in enumerate(keys):
+            found, answers[i] = self._lookup(key)
+            if not found:
+                missing.append(i)
+        self.misses += len(missing)
+        computed = None
+        if missing and self._query_many is not None:
+            try:
+                computed = self._query_many([keys[i] for i in missing])
+                computed = computed.tolist() if hasattr(computed, "tolist") else list(computed)
+            except ValueError: #some trajects are not connected : one at a time
+                computed = None
+        for j, i in enumerate(missing):
+            if computed is not None:
+                answers[i] = computed[j]
+            else:
+                try:
+                    answers[i] = self._query(*keys[i])
+                    answers[i] = answers[i].item() if hasattr(answers[i], "item") else answers[i]
+                except ValueError:
+                    answers[i] = None
+            self._remember(keys[i], answers[i])
+        return answers
+
+    def stats(self):
+        """Returns the numbers of hits and misses, and the proportion of queries answered by the cache"""
+        total = self.hits + self.store_hits + self.misses
+        return {"hits": self.hits, "store_hits": self.store_hits, "misses": self.misses, "size": len(self._lru),
+                "hit_rate": (self.hits + self.store_hits) / total if total else 0.0}
+
+    def close(self):
+        """Saves the pending answers in the store"""
+        if self.store is not None:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
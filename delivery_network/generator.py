@@ -0,0 +1,245 @@
+"""
+Generation of synthetic network.x.in, routes.x.in and trucks.x.in files, to test the solvers on
+bigger inputs than the ones of the input folder.
+
+Everything is drawn with numpy from a seed (same seed, same files) and written in bulk, chunk by
+chunk, so that networks of tens of millions of edges are generated in a few seconds per million
+edges. Three topologies are available :
+    - "tree" : a random recursive tree (node i is linked to a random node < i) plus random edges
+    - "grid" : a grid of about sqrt(n) x sqrt(n) nodes plus random edges
+    - "geometric" : random points in the unit square linked when they are closer than a radius
+      chosen to get about m edges (plus a chain making the graph connected if connected=True)
+and three distributions of the powers : "uniform", "lognormal" (a few very high powers) and
+"distance" (the power grows with the distance of the edge, plus some noise).
+"""
+import os
+from lazy import lazy_import
+
+np = lazy_import("numpy")
+
+CHUNK_SIZE = 1 << 20 #the number of lines formatted and written at once
+
+
+def _write_rows(filename, header, rows):
+    """Writes the header line then the rows of an array of integers, chunk by chunk"""
+    rows = np.asarray(rows, dtype=np.int64)
+    width = rows.shape[1] if rows.ndim == 2 else 0
+    line = " ".join(["%d"] * width) + "\n"
+    with open(filename, "w", buffering=CHUNK_SIZE) as file:
+        file.write(header + "\n")
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            file.write((line * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def write_network(filename, nb_nodes, edges):
+    """
+    Writes a network.x.in file.
+
+    Parameters:
+    -----------
+    filename: str
+        The name of the file
+    nb_nodes: int
+        The number of nodes (the nodes are 1..nb_nodes)
+    edges: np.ndarray
+        An array of shape (m, 3) or (m, 4) : node1 node2 power_min [dist]
+    """
+    _write_rows(filename, "{} {}".format(nb_nodes, len(edges)), edges)
+
+
+def write_routes(filename, routes):
+    """Writes a routes.x.in file from an array of shape (T, 3) : city1 city2 utility"""
+    _write_rows(filename, str(len(routes)), routes)
+
+
+def write_trucks(filename, trucks):
+    """Writes a trucks.x.in file from an array of shape (K, 2) : power cost"""
+    _write_rows(filename, str(len(trucks)), trucks)
+
+
+def _random_pairs(rng, nb_nodes, count):
+    """count random edges between distinct nodes"""
+    src = rng.integers(1, nb_nodes + 1, count)
+    dst = rng.integers(1, nb_nodes, count)
+    dst += dst >= src #dst != src
+    return src, dst
+
+
+def _tree(rng, nb_nodes):
+    src = np.arange(2, nb_nodes + 1)
+    dst = (rng.random(nb_nodes - 1) * (src - 1)).astype(np.int64) + 1 #a random node < src
+    return src, dst, None
+
+
+def _grid(rng, nb_nodes):
+    cols = int(np.ceil(np.sqrt(nb_nodes)))
+    nodes = np.arange(1, nb_nodes + 1)
+    right = nodes[(nodes % cols != 0) & (nodes + 1 <= nb_nodes)]
+    down = nodes[nodes + cols <= nb_nodes]
+    src = np.concatenate([right, down])
+    dst = np.concatenate([right + 1, down + cols])
+    points = np.column_stack([(nodes - 1) % cols, (nodes - 1) // cols]) / cols
+    return src, dst, points
+
+
+def _geometric(rng, nb_nodes, nb_edges, connected):
+    """
+    Random geometric graph : the points are put in square cells of side radius, so that only the
+    pairs of points in the same cell or in neighboring cells are compared.
+    """
+    points = rng.random((nb_nodes, 2))
+    radius = min(np.sqrt(2 * nb_edges / (np.pi * nb_nodes * nb_nodes)), 1.0) #about nb_edges pairs closer than radius
+    side = max(int(1 / radius), 1)
+    cells = np.minimum((points * side).astype(np.int64), side - 1)
+    cell = cells[:, 0] * side + cells[:, 1]
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=side * side)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    sorted_cells = cells[order]
+
+    src, dst = [], []
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)): #each pair of neighboring cells once
+        x, y = sorted_cells[:, 0] + dx, sorted_cells[:, 1] + dy
+        valid = np.flatnonzero((x < side) & (y >= 0) & (y < side))
+        other = x[valid] * side + y[valid]
+        sizes = counts[other]
+        first = np.repeat(valid, sizes)
+        offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        second = np.repeat(starts[other], sizes) + offsets
+        if dx == 0 and dy == 0:
+            keep = second > first
+            first, second = first[keep], second[keep]
+        a, b = order[first], order[second]
+        close = np.sum((points[a] - points[b]) ** 2, axis=1) <= radius ** 2
+        src.append(a[close])
+        dst.append(b[close])
+    if connected: #consecutive points in the order of the cells : short edges in general
+        src.append(order[:-1])
+        dst.append(order[1:])
+    return np.concatenate(src) + 1, np.concatenate(dst) + 1, points
+
+
+def generate_network(nb_nodes, nb_edges=None, topology="tree", power="uniform", max_power=10**6,
+                     max_dist=10**4, connected=True, seed=None):
+    """
+    Generates a random network.
+
+    Parameters:
+    -----------
+    nb_nodes: int
+        The number of nodes n (the nodes are 1..n)
+    nb_edges: int, optional
+        The number of edges wanted. For "tree" and "grid", random edges are added to the base
+        graph until nb_edges ; for "geometric" it is the expected number. Default is n.
+    topology: str, optional
+        "tree", "grid" or "geometric". Default is "tree".
+    power: str, optional
+        "uniform", "lognormal" or "distance". Default is "uniform".
+    max_power: int, optional
+        The maximal power of an edge. Default is 10**6.
+    max_dist: int, optional
+        The maximal distance of an edge. Default is 10**4.
+    connected: bool, optional
+        For "geometric", adds the edges making the graph connected. Default is True (the other
+        topologies are always connected).
+    seed: int, optional
+        The seed of the random generator
+
+    Outputs:
+    -----------
+    edges: np.ndarray
+        An array of shape (m, 4) : node1 node2 power_min dist, without self loops nor duplicates
+    """
+    if nb_nodes < 2:
+        raise ValueError("A network needs at least 2 nodes.")
+    nb_edges = nb_nodes if nb_edges is None else nb_edges
+    rng = np.random.default_rng(seed)
+
+    if topology == "tree":
+        src, dst, points = _tree(rng, nb_nodes)
+    elif topology == "grid":
+        src, dst, points = _grid(rng, nb_nodes)
+    elif topology == "geometric":
+        src, dst, points = _geometric(rng, nb_nodes, nb_edges, connected)
+    else:
+        raise ValueError("Unknown topology: {}".format(topology))
+    if topology != "geometric" and len(src) < nb_edges:
+        extra_src, extra_dst = _random_pairs(rng, nb_nodes, nb_edges - len(src))
+        src, dst = np.concatenate([src, extra_src]), np.concatenate([dst, extra_dst])
+
+    low, high = np.minimum(src, dst), np.maximum(src, dst) #removes the duplicates
+    _, first = np.unique(low * (nb_nodes + 1) + high, return_index=True)
+    first.sort()
+    src, dst = src[first], dst[first]
+
+    if points is None:
+        dist = rng.integers(1, max_dist + 1, len(src))
+    else: #the euclidean distance, scaled to [1, max_dist]
+        length = np.sqrt(np.sum((points[src - 1] - points[dst - 1]) ** 2, axis=1))
+        dist = np.maximum((length / max(length.max(), 1e-12) * max_dist).astype(np.int64), 1)
+
+    if power == "uniform":
+        powers = rng.integers(1, max_power + 1, len(src))
+    elif power == "lognormal":
+        values = rng.lognormal(0, 1, len(src))
+        powers = values / values.max() * max_power
+    elif power == "distance":
+        powers = dist / max_dist * max_power * rng.uniform(0.5, 1, len(src))
+    else:
+        raise ValueError("Unknown power distribution: {}".format(power))
+    powers = np.clip(np.asarray(powers).astype(np.int64), 1, max_power)
+    return np.column_stack([src, dst, powers, dist]).astype(np.int64)
+
+
+def generate_routes(nb_nodes, nb_routes, max_utility=10**4, seed=None):
+    """
+    Generates random routes between distinct nodes.
+
+    Outputs:
+    -----------
+    routes: np.ndarray
+        An array of shape (nb_routes, 3) : city1 city2 utility
+    """
+    rng = np.random.default_rng(seed)
+    src, dst = _random_pairs(rng, nb_nodes, nb_routes)
+    return np.column_stack([src, dst, rng.integers(1, max_utility + 1, nb_routes)]).astype(np.int64)
+
+
+def generate_trucks(nb_trucks, max_power=10**6, cost_per_power=100, seed=None):
+    """
+    Generates a catalogue of trucks : the powers are spread up to max_power, the cost grows with
+    the power (a bit more than linearly) with some noise, so that some trucks are dominated.
+
+    Outputs:
+    -----------
+    trucks: np.ndarray
+        An array of shape (nb_trucks, 2) : power cost
+    """
+    rng = np.random.default_rng(seed)
+    powers = np.sort(rng.integers(1, max_power + 1, nb_trucks))
+    powers[-1] = max_power #every route can be covered
+    costs = cost_per_power * powers * (1 + powers / max_power) * rng.uniform(0.8, 1.2, nb_trucks)
+    return np.column_stack([powers, np.maximum(costs.astype(np.int64), 1)])
+
+
+def generate_files(folder, x, nb_nodes, nb_edges=None, nb_routes=100000, nb_trucks=100, topology="tree",
+                   power="uniform", max_power=10**6, seed=None):
+    """
+    Writes folder/network.x.in, folder/routes.x.in and folder/trucks.x.in.
+
+    The three files are drawn from independent generators derived from seed, so that changing
+    the number of routes does not change the network.
+
+    Outputs:
+    -----------
+    filenames: list of str
+        The names of the three files
+    """
+    os.makedirs(folder, exist_ok=True)
+    network_seed, routes_seed, trucks_seed = np.random.SeedSequence(seed).spawn(3)
+    filenames = [os.path.join(folder, "{}.{}.in".format(name, x)) for name in ("network", "routes", "trucks")]
+    write_network(filenames[0], nb_nodes, generate_network(nb_nodes, nb_edges, topology, power, max_power, seed=network_seed))
+    write_routes(filenames[1], generate_routes(nb_nodes, nb_routes, seed=routes_seed))
+    write_trucks(filenames[2], generate_trucks(nb_trucks, max_power, seed=trucks_seed))
+    return filenames
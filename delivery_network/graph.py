@@ -1,4 +1,18 @@
-import typing
+"""
+The graphs (Graph, and CSRGraph for big networks) and the minimal power algorithms : connected
+components, kruskal, MinPowerTree, PowerThresholdIndex.
+
+The other parts of the project are in separate modules, so that importing this one is cheap :
+loader (reading the files), solvers (trucks and knapsack), visualization (graphviz). Their
+functions can still be imported from here (from graph import graph_from_file, knapsack, ...) :
+the module is only imported at the first such access. numpy is loaded at its first use.
+"""
+import heapq
+import time
+from instrumentation import count, stage
+from lazy import lazy_import
+
+np = lazy_import("numpy")
 
 class Graph:
     """
@@ -16,6 +30,9 @@ class Graph:
         The number of nodes.
     nb_edges: int
         The number of edges. 
+    mst: Graph or None
+        The minimum spanning tree of the graph, kept up to date by add_edge, remove_edge and
+        update_power once maintain_mst has been called (None before)
     """
 
     def __init__(self, nodes=[]):
@@ -30,6 +47,11 @@ class Graph:
         self.graph = dict([(n, []) for n in nodes])
         self.nb_nodes = len(nodes)
         self.nb_edges = 0
+        self._components = None #(index of each node, labels, sizes), see component_labels
+        self._rooted = None #(parent, depth, root) of each node, see _rooted_forest
+        self.mst = None
+        self._power_tree = None #MinPowerTree of self.mst, built at the first query_min_power and then updated
+        self._answers = {} #answers of query_min_power, {(src, dest): power}
     
 
     def __str__(self):
@@ -73,6 +95,192 @@ class Graph:
         self.graph[node1].append((node2, power_min, dist))
         self.graph[node2].append((node1, power_min, dist))
         self.nb_edges += 1
+        self._components = None
+        self._rooted = None
+        if self.mst is not None:
+            self._insert_in_mst(node1, node2, power_min, dist)
+
+    def _add_edge_array(self, edges):
+        """
+        Adds at once the edges of an array of shape (m, 4) : node1 node2 power_min dist, as m calls
+        to add_edge would (same adjacency lists, in the same order). The adjacency entries are
+        grouped by node with numpy, hence no Python call per edge. Used by graph_from_file on a new
+        graph whose nodes are 1..n ; otherwise (or with a maintained tree) add_edge is called.
+        """
+        edges = np.asarray(edges)
+        m = len(edges)
+        n = len(self.nodes)
+        if self.mst is not None or list(self.nodes) != list(range(1, n + 1)) or \
+           (m and (edges[:, :2].min() < 1 or edges[:, :2].max() > n)):
+            for node1, node2, power_min, dist in edges.tolist():
+                self.add_edge(node1, node2, power_min, dist)
+            return
+        heads = edges[:, :2].ravel() #node1 then node2 for each edge, in the order of the edges
+        order = np.argsort(heads, kind="stable")
+        entries = list(zip(edges[:, 1::-1].ravel()[order].tolist(), np.repeat(edges[:, 2], 2)[order].tolist(),
+                           np.repeat(edges[:, 3], 2)[order].tolist()))
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(heads, minlength=n + 1))]).tolist()
+        lists = map(entries.__getitem__, map(slice, offsets[1:-1], offsets[2:])) #the entries of the nodes 1..n
+        if self.nb_edges == 0:
+            self.graph = dict(zip(range(1, n + 1), lists))
+        else:
+            for node, adjacency in zip(range(1, n + 1), lists):
+                self.graph[node] += adjacency
+        self.nb_edges += m
+        self._components = None
+        self._rooted = None
+
+    def remove_edge(self, node1, node2, power_min=None):
+        """
+        Removes an edge (node1, node2) of the graph : the one with the given minimal power, or the
+        first one found if power_min is None. If the edge was in the maintained minimum spanning
+        tree, it is replaced by the lightest edge between the two parts of the tree.
+
+        Parameters: 
+        -----------
+        node1, node2: NodeType
+            The ends of the edge
+        power_min: numeric (int or float), optional
+            Minimum power of the edge to remove
+
+        Outputs:
+        -----------
+        power_min, dist: numeric
+            The minimal power and the distance of the removed edge
+        """
+        for neighbor, power, dist in self.graph.get(node1, []):
+            if neighbor == node2 and (power_min is None or power == power_min):
+                break
+        else:
+            raise ValueError("There is no edge ({}, {}) in the graph.".format(node1, node2))
+        self._remove_entry(node1, node2, power, dist)
+        if self.mst is not None and (node2, power, dist) in self.mst.graph.get(node1, []):
+            self._remove_from_mst(node1, node2, power, dist)
+        return power, dist
+
+    def update_power(self, node1, node2, power_min, old_power=None):
+        """
+        Changes the minimal power of an edge (node1, node2) (the one with the power old_power,
+        or the first one found), keeping its distance. The minimum spanning tree is updated as
+        for a removal followed by an addition.
+        """
+        _, dist = self.remove_edge(node1, node2, old_power)
+        self.add_edge(node1, node2, power_min, dist)
+
+    def _remove_entry(self, node1, node2, power_min, dist):
+        """Removes the edge from the adjacency lists of both its ends"""
+        self.graph[node1].remove((node2, power_min, dist))
+        self.graph[node2].remove((node1, power_min, dist)) #for a loop, the second entry of the same list
+        self.nb_edges -= 1
+        self._components = None
+        self._rooted = None
+    
+
+    def maintain_mst(self):
+        """
+        Computes the minimum spanning tree with kruskal and keeps it up to date from now on :
+        each add_edge, remove_edge or update_power then costs O(V+E) at worst (a search in the
+        tree, and for the removal of a tree edge a scan of the edges of one part of the tree),
+        instead of O(E log E) for a new kruskal.
+
+        Outputs:
+        -----------
+        mst: Graph
+            The minimum spanning tree (self.mst)
+        """
+        if self.mst is None:
+            self.mst = kruskal(self)
+            self._invalidate(float("-inf"))
+        return self.mst
+
+    def _insert_in_mst(self, node1, node2, power_min, dist):
+        """
+        A new edge closes a cycle in the tree : it replaces the heaviest edge of the cycle if
+        this edge needs more power. If node1 and node2 were not connected, it joins the two trees.
+        """
+        if node1 == node2:
+            return
+        parent = {}
+        if node1 not in self.mst.graph or not self.mst._search_with_power(node1, node2, float("inf"), parent):
+            self.mst.add_edge(node1, node2, power_min, dist)
+            #no answer changes : the two trees were not connected ; the smallest one is hung from the other
+            if self._power_tree is not None and self._power_tree.component_size(node1) < self._power_tree.component_size(node2):
+                node1, node2 = node2, node1
+            self._rehang(node2, node1, power_min)
+            return
+        path = self.mst._path_from_parents(parent, node2)
+        heaviest = None #(power, node_a, node_b, dist) of the heaviest edge of the path
+        for a, b in zip(path, path[1:]):
+            power, d = next((power, d) for neighbor, power, d in self.mst.graph[a] if neighbor == b)
+            if heaviest is None or power > heaviest[0]:
+                heaviest = (power, a, b, d)
+        if heaviest[0] > power_min:
+            tree = self._power_tree
+            self.mst._remove_entry(heaviest[1], heaviest[2], heaviest[0], heaviest[3])
+            self.mst.add_edge(node1, node2, power_min, dist)
+            if tree is not None: #the part under the removed edge is hung from its end of the new edge
+                child = heaviest[1] if tree.depth[heaviest[1]] > tree.depth[heaviest[2]] else heaviest[2]
+                if tree.is_ancestor(child, node2):
+                    node1, node2 = node2, node1
+                self._rehang(node1, node2, power_min)
+            self._invalidate(heaviest[0])
+
+    def _remove_from_mst(self, node1, node2, power_min, dist):
+        """
+        Removing a tree edge cuts the tree in two parts : the lightest edge of the graph between
+        the two parts (if any) joins them again.
+        """
+        tree = self._power_tree
+        self.mst._remove_entry(node1, node2, power_min, dist)
+        part = {}
+        self.mst._search_with_power(node1, node2, float("inf"), part) #all the part of node1
+        best = None
+        for node in part:
+            for neighbor, power, d in self.graph[node]:
+                if neighbor not in part and (best is None or power < best[0]):
+                    best = (power, node, neighbor, d)
+        if best is not None:
+            self.mst.add_edge(best[1], best[2], best[0], best[3])
+        if tree is not None: #the part under the removed edge moves, the rest of the tree does not
+            node1_below = tree.depth[node1] > tree.depth[node2]
+            if best is None:
+                self._rehang(node1 if node1_below else node2)
+            elif node1_below:
+                self._rehang(best[1], best[2], best[0])
+            else:
+                self._rehang(best[2], best[1], best[0])
+        self._invalidate(power_min)
+
+    def _rehang(self, start, above=None, power=0):
+        """
+        Updates the MinPowerTree of the tree after a change that only moved the part of start
+        (see MinPowerTree.rehang) ; it is dropped, and built again at the next query, only if
+        it can not be updated.
+        """
+        if self._power_tree is not None and not self._power_tree.rehang(self.mst, start, above, power):
+            self._power_tree = None
+
+    def _invalidate(self, power):
+        """
+        The tree changed for the edges of power >= power : only the answers >= power may be
+        wrong (a path of maximal power < power does not go through these edges), the others are kept.
+        """
+        self._answers = dict((key, answer) for key, answer in self._answers.items() if answer < power)
+
+    def query_min_power(self, src, dest):
+        """
+        Returns the minimal power to travel the traject between src and dest, using the maintained
+        minimum spanning tree (see maintain_mst) and a MinPowerTree built at the first query.
+        An update of the tree only changes the tables of the part of the tree that moves
+        (see _rehang), and the answers are kept until an update of the tree can change them.
+        The nodes have to be the integers 1..n.
+        """
+        key = (src, dest) if src <= dest else (dest, src)
+        if key not in self._answers:
+            if self._power_tree is None:
+                self._power_tree = MinPowerTree(self.maintain_mst())
+            self._answers[key] = self._power_tree.query(src, dest)
+        return self._answers[key]
     
 
     def get_path_with_power(self, src, dest, power):
@@ -91,43 +299,326 @@ class Graph:
         power : numeric (int or float)
             Power to test
         """
-        visited = set()
-        stack = [(src, [], 0)]  #(node, path, total power)
-        while stack:
-            node, path, total_power = stack.pop()
-            if node == dest and total_power <=power:
-                return path + [dest]
-            if node not in visited:
-                visited.add(node)
-                for neighbor, min_power, _ in self.graph[node]:
-                    if min_power <= power and neighbor not in visited:
-                        stack.append((neighbor, path + [node], max(min_power, total_power)))
+        parent = {}
+        if self._search_with_power(src, dest, power, parent):
+            return self._path_from_parents(parent, dest)
         return None
     #complexité en O(V+E)
 
+    def reachable_with_power(self, src, dest, power):
+        """
+        Returns True if the traject can be travelled with the given power, False otherwise.
+        Same search as get_path_with_power, but no path is built. The complexity is O(V+E).
 
-    def connected_components(self):
-        visited = set()
-        components = []
-        for node in self.nodes:
-            if node not in visited:
-                component = []
-                self._dfs(node, visited, component)
-                components.append(component)
-        return components
+        Parameters: 
+        -----------
+        src : NodeType
+            First node of the traject
+        dest : NodeType
+            Last node of the traject
+        power : numeric (int or float)
+            Power to test
+        """
+        return self._search_with_power(src, dest, power, {})
+
+    def _search_with_power(self, src, dest, power, parent):
+        """
+        Depth-first search from src using only the edges with a minimal power <= power.
+        parent is filled with the predecessor of each visited node (src is its own predecessor),
+        so that a path never has to be copied. Returns True if dest is reached.
+        """
+        stack = [(src, src)]  #(node, predecessor)
+        pushes = 1
+        found = False
+        while stack:
+            node, previous = stack.pop()
+            if node in parent:
+                continue
+            parent[node] = previous
+            if node == dest:
+                found = True
+                break
+            for neighbor, min_power, _ in self.graph[node]:
+                if min_power <= power and neighbor not in parent:
+                    stack.append((neighbor, node))
+                    pushes += 1
+        count("search.nodes_visited", len(parent))
+        count("search.stack_pushes", pushes)
+        return found
+
+    def shortest_path_with_power(self, src, dest, power):
+        """
+        Returns the shortest path (in distance) from src to dest for a truck of the given power,
+        i.e. using only the edges with a minimal power <= power, or None if there is no such path.
+
+        It is a bidirectional Dijkstra : a search from src and a search from dest (the graph is not
+        oriented) are run in turn, the one with the smallest heap going on. Each time an edge joins
+        the two searches, the length of the path through it is compared to the best one. The search
+        stops as soon as the sum of the two smallest distances in the heaps is >= the best length :
+        no path going through a node not yet settled can be shorter. The distances must be >= 0.
+        The complexity is O(E log V), but far fewer nodes are settled than with one search when
+        the traject is short compared to the graph.
+
+        Parameters:
+        -----------
+        src : NodeType
+            First node of the traject
+        dest : NodeType
+            Last node of the traject
+        power : numeric (int or float)
+            Power of the truck
+
+        Outputs:
+        -----------
+        path : list
+            The shortest path between src and dest travelled with the power, None if there is none
+        dist : numeric
+            The length of the path (only if there is a path)
+        """
+        if src == dest:
+            return [src], 0
+        best = ({src: 0}, {dest: 0}) #distance known from src (resp. to dest) for each node
+        parent = ({src: src}, {dest: dest})
+        done = (set(), set())
+        heaps = ([(0, src)], [(0, dest)])
+        shortest, meeting = None, None #meeting : the edge (a, b) of the best path, a on the side of src
+        while heaps[0] and heaps[1]:
+            if shortest is not None and heaps[0][0][0] + heaps[1][0][0] >= shortest:
+                break
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            dist, node = heapq.heappop(heaps[side])
+            if node in done[side]:
+                continue
+            done[side].add(node)
+            for neighbor, power_min, d in self.graph[node]:
+                if power_min > power:
+                    continue
+                dist_neighbor = dist + d
+                if neighbor not in done[side] and (neighbor not in best[side] or dist_neighbor < best[side][neighbor]):
+                    best[side][neighbor] = dist_neighbor
+                    parent[side][neighbor] = node
+                    heapq.heappush(heaps[side], (dist_neighbor, neighbor))
+                if neighbor in best[1 - side]:
+                    length = dist_neighbor + best[1 - side][neighbor]
+                    if shortest is None or length < shortest:
+                        shortest = length
+                        meeting = (node, neighbor) if side == 0 else (neighbor, node)
+        count("shortest_path.nodes_settled", len(done[0]) + len(done[1]))
+        if shortest is None:
+            return None
+        #the meeting edge may have been found before the final distances of its ends, but the
+        #path rebuilt from the current parents is never longer than shortest, hence it is optimal
+        a, b = meeting
+        return self._path_from_parents(parent[0], a) + self._path_from_parents(parent[1], b)[::-1], shortest
+
+    def shortest_paths_with_power(self, src, power, dests=None):
+        """
+        Batch version of shortest_path_with_power for many destinations from the same source :
+        one Dijkstra search from src, on the edges with a minimal power <= power, gives the
+        shortest path to every destination. The search stops when all the destinations are settled.
+        The complexity is O(E log V) for all the destinations.
+
+        Parameters:
+        -----------
+        src : NodeType
+            First node of the trajects
+        power : numeric (int or float)
+            Power of the truck
+        dests : iterable, optional
+            The last nodes of the trajects. Default is all the nodes of the graph.
+
+        Outputs:
+        -----------
+        paths : dict
+            paths[dest] is (path, dist) as returned by shortest_path_with_power, or None if dest
+            can not be reached with the power
+        """
+        dests = list(self.nodes) if dests is None else list(dests)
+        waiting = set(dests)
+        best = {src: 0}
+        parent = {src: src}
+        done = set()
+        heap = [(0, src)]
+        while heap and waiting:
+            dist, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            waiting.discard(node)
+            for neighbor, power_min, d in self.graph[node]:
+                dist_neighbor = dist + d
+                if power_min <= power and neighbor not in done and (neighbor not in best or dist_neighbor < best[neighbor]):
+                    best[neighbor] = dist_neighbor
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (dist_neighbor, neighbor))
+        count("shortest_path.nodes_settled", len(done))
+        return dict((dest, (self._path_from_parents(parent, dest), best[dest]) if dest in done else None)
+                    for dest in dests)
+
+    def pareto_routes(self, src, dest, max_points=None, max_time=None):
+        """
+        Returns the Pareto frontier power / distance of the traject between src and dest : for each
+        truck power where the shortest distance changes, the minimal power of the threshold and the
+        shortest path under it.
 
-    def _dfs(self, node, visited, component):
+        The frontier is built from the shortest path side : a Dijkstra search ordered by
+        (distance, power of the path) gives the shortest path with the smallest power P among the
+        shortest ones, which is a point of the frontier. The next point is the same search on the
+        edges with a minimal power < P, and so on until dest can not be reached. There is one search
+        per point (plus one), each on a smaller graph, instead of one per distinct power.
+
+        Parameters:
+        -----------
+        src : NodeType
+            First node of the traject
+        dest : NodeType
+            Last node of the traject
+        max_points : int, optional
+            Stop after this number of points. Default is None (no limit).
+        max_time : float, optional
+            Stop after this number of seconds (checked between two searches). Default is None (no limit).
+
+        Outputs:
+        -----------
+        frontier : list
+            The points (power, dist, path) by increasing power (and decreasing distance) : path is
+            the shortest path for a truck of a power in [power, power of the next point[, of length dist
+        complete : bool
+            False if a limit stopped the search : the points of smallest power are then missing
+        """
+        if src == dest:
+            return [(0, 0, [src])], True
+        deadline = None if max_time is None else time.perf_counter() + max_time
+        frontier = []
+        limit = float("inf")
+        complete = True
+        while True:
+            if (max_points is not None and len(frontier) >= max_points) or \
+               (deadline is not None and time.perf_counter() > deadline):
+                complete = False
+                break
+            point = self._shortest_path_below(src, dest, limit)
+            if point is None:
+                break
+            frontier.append(point)
+            limit = point[0]
+        count("pareto.searches", len(frontier) + complete)
+        return frontier[::-1], complete
+
+    def _shortest_path_below(self, src, dest, limit):
         """
-        Depth-first search implementation used by the connected_components method.
-        As indicated in the guideline
+        Dijkstra search from src on the edges with a minimal power < limit, ordered by
+        (distance, power of the path) : returns (power, dist, path) for the shortest path of
+        smallest power, or None if dest can not be reached.
         """
-        visited.add(node)
-        component.append(node)
-        for neighbor, _, _ in self.graph[node]:
-            if neighbor not in visited:
-                self._dfs(neighbor, visited, component)
+        best = {src: (0, 0)}
+        parent = {src: src}
+        done = set()
+        heap = [(0, 0, src)]
+        while heap:
+            dist, power, node = heapq.heappop(heap)
+            if node == dest:
+                count("pareto.nodes_settled", len(done))
+                return power, dist, self._path_from_parents(parent, dest)
+            if node in done:
+                continue
+            done.add(node)
+            for neighbor, power_min, d in self.graph[node]:
+                if power_min >= limit or neighbor in done:
+                    continue
+                label = (dist + d, max(power, power_min))
+                if neighbor not in best or label < best[neighbor]:
+                    best[neighbor] = label
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (label[0], label[1], neighbor))
+        count("pareto.nodes_settled", len(done))
+        return None
 
 
+    def _find_components(self):
+        """
+        Computes (once, until the next add_edge) the connected components with a union-find
+        on the positions of the nodes in self.nodes : no recursion, hence no recursion limit
+        on long chains. The complexity is O(V+E).
+        """
+        if self._components is None:
+            index = dict((node, i) for i, node in enumerate(self.nodes))
+            sets = UnionFind(len(index))
+            for node in self.nodes:
+                for neighbor, _, _ in self.graph[node]:
+                    sets.union(index[node], index[neighbor])
+            ids = {} #the components are numbered in the order of their first node
+            labels = np.array([ids.setdefault(sets.find(i), len(ids)) for i in range(len(index))], dtype=np.int64)
+            self._components = (index, labels, np.bincount(labels, minlength=len(ids)))
+        return self._components
+
+    def component_labels(self):
+        """
+        Returns the connected components as an array of labels.
+
+        Outputs:
+        -----------
+        labels: np.ndarray
+            labels[i] is the number (0, 1, ...) of the component of the node self.nodes[i] ;
+            the components are numbered in the order of their first node
+        sizes: np.ndarray
+            sizes[k] is the number of nodes of the component k
+        """
+        _, labels, sizes = self._find_components()
+        return labels, sizes
+
+    def same_component(self, a, b):
+        """
+        Returns True if the nodes a and b are in the same connected component.
+        O(1) once the components are computed.
+        """
+        index, labels, _ = self._find_components()
+        return labels[index[a]] == labels[index[b]]
+
+    def _rooted_forest(self):
+        """
+        Roots each connected component at its first node (in the order of self.nodes) with an
+        iterative DFS, and keeps the result until the next change of the graph. Meant for trees
+        and forests (on other graphs, a DFS spanning forest is rooted).
+
+        Outputs:
+        -----------
+        parent: dict
+            parent[node] = (parent of node, minimal power of the edge between them), None for a root
+        depth: dict
+            depth[node] is the number of edges between node and its root
+        root: dict
+            root[node] is the root of the component of node
+        """
+        if self._rooted is None:
+            parent, depth, root = {}, {}, {}
+            for start in self.nodes:
+                if start in depth:
+                    continue
+                parent[start], depth[start], root[start] = None, 0, start
+                stack = [start]
+                while stack:
+                    node = stack.pop()
+                    for neighbor, power, _ in self.graph[node]:
+                        if neighbor not in depth:
+                            parent[neighbor] = (node, power)
+                            depth[neighbor] = depth[node] + 1
+                            root[neighbor] = start
+                            stack.append(neighbor)
+            self._rooted = (parent, depth, root)
+        return self._rooted
+
+    def connected_components(self):
+        """
+        Returns the list of the connected components (one list of nodes per component,
+        in the order of self.nodes)
+        """
+        labels, sizes = self.component_labels()
+        components = [[] for _ in range(len(sizes))]
+        for node, label in zip(self.nodes, labels.tolist()):
+            components[label].append(node)
+        return components
+
     def connected_components_set(self):
         """
         The result should be a set of frozensets (one per component), 
@@ -139,11 +630,15 @@ class Graph:
         """
         This function should return path, min_power. 
 
-        The aim of this function is to use binary research in order to return the minimum power
-        to travel a traject.
+        The aim of this function is to return the minimum power to travel a traject, with a
+        bottleneck (minimax) version of Dijkstra : the heap is ordered by the maximal power met
+        on the path so far, instead of the length of the path. The first time dest leaves the heap,
+        its power is exact (also for non integer powers). Only the predecessor of each node is stored,
+        the path is rebuilt at the end.
         If the two nodes are not in the same connected components, the function return an error
+        at once (see same_component).
 
-        The complexity of this function is O(V+E).
+        The complexity of this function is O(E log V).
 
         Parameters:
         -----------
@@ -159,30 +654,49 @@ class Graph:
         power : int
             The minimum power required to travel the traject between src and dest
         """
-        #Using binary research
-
-        #Find min and max of edges' weight 
-        _list_edges = [i[0] for i in g.graph.values() if len(i)>0]
-        a = min([j[1] for j in _list_edges])
-        b = max([j[1] for j in _list_edges])
-        #From this point it is the real function
-        while (b-a) >= 1:
-            if self.get_path_with_power(src, dest, (a+b)/2) != None:
-                b = (a+b)/2
-            else : 
-                a = (a+b)/2
-        if self.get_path_with_power(src, dest, int(b)) != None:
-            return self.get_path_with_power(src, dest, int(b)), int(b)    #assumed here that power is always an integer 
+        if not self.same_component(src, dest):
+            raise ValueError("The two given nodes are not in the same connected component.")
+        best = {src: 0} #minimal power known to reach each node
+        parent = {src: src}
+        done = set()
+        heap = [(0, src)]
+        while heap:
+            power, node = heapq.heappop(heap)
+            if node == dest:
+                count("min_power.nodes_settled", len(done))
+                return self._path_from_parents(parent, dest), power
+            if node in done:
+                continue
+            done.add(node)
+            for neighbor, power_min, _ in self.graph[node]:
+                power_neighbor = max(power, power_min)
+                if neighbor not in done and (neighbor not in best or power_neighbor < best[neighbor]):
+                    best[neighbor] = power_neighbor
+                    parent[neighbor] = node
+                    heapq.heappush(heap, (power_neighbor, neighbor))
         raise ValueError("The two given nodes are not in the same connected component.")
 
-    def view(self, node1 = None, node2 = None):
+    @staticmethod
+    def _path_from_parents(parent, dest):
+        """
+        Rebuilds the path ending at dest from a dictionary of predecessors
+        (the start node is its own predecessor).
+        """
+        path = [dest]
+        while parent[path[-1]] != path[-1]:
+            path.append(parent[path[-1]])
+        return path[::-1]
+
+    def view(self, node1 = None, node2 = None, k = None):
         """
         This function allow a visualisation of a graph
 
         Actually this function takes 2 nodes of the graph and display the entire graph with
         the shortest (meaning the least weight-costly) path between the two nodes in red.
         If the function does not recieve two nodes it will simply display the graph.
+        For a big graph, k limits the drawing to the path and the nodes at most k edges away from it.
         The function automatically save the Graph in the file ../graph_viz_output
+        (the DOT file is written directly, see visualization)
 
         Parameters:
         -----------
@@ -190,505 +704,844 @@ class Graph:
             A node of the graph
         node2 : NodeType
             Another node of the graph
+        k : int, optional
+            The size of the neighborhood drawn around the path. Default is None (the whole graph).
         
         Outputs:
         -----------
         None
         """
-        import graphviz
-        dot = graphviz.Graph('Graph', comment='Graph visualisation', graph_attr = {"concentrate" : 'True'})
-        verified_edge = [] #list of the already implemented edges
-
-        #Initially, we create all the nodes
-        for i in self.graph:
-            dot.node('{}'.format(i))   
-
-        cpt = 0
-
-        if ((node1 != None) and (node2 != None)): #then we have to print the grap and the path
-            path, _ = self.min_power(node1, node2)
-            for i in self.graph:
-                
-                #we will colorize the path's nodes in red
-                if i in path:
-                    dot.node('{}'.format(i), color = 'red', fontcolor = 'red')
-                    cpt = path.index(i)+1 # type: ignore
-                    cpt = np.min([cpt, len(path)-1]) # type: ignore
-                
-                for j in self.graph[i]: #check all the i's neighbors
-                    #now, we implement the edges
-                    if ({i, j[0]} not in verified_edge) and (i in path) and (j[0] == path[cpt]): # type: ignore
-                        #the following if is to avoid colorizing the edge between Node1 and Node2
-                        #if the path is [Node1, ..., Node2]
-                        if (i == path[0]) and (j[0]== path[-1]) and (len(path) != 2): # type: ignore
-                            #implementing in BLACK the edge between path[0] and path[-1]
-                            #avoiding the case where the path is [node1, node2]
-                            dot.edge('{}'.format(i), '{}'.format(j[0]), weight = "{}".format(j[1]), label = "weight = {}\n length = {}".format(j[1], j[2]))
-                            verified_edge.append({i, j[0]})
-                        else:
-                            #implementing in RED all the edges of the path
-                            dot.edge('{}'.format(i), '{}'.format(j[0]), weight = "{}".format(j[1]), label = "weight = {}\n length = {}".format(j[1], j[2]), color = 'red')
-                            verified_edge.append({i, j[0]})
-
-            #implementing all the other edges of the graph
-            for i in self.graph:
-                for j in self.graph[i]:
-                    if {i, j[0]} not in verified_edge:
-                        dot.edge('{}'.format(i), '{}'.format(j[0]), weight = "{}".format(j[1]), label = "weight = {}\n length = {}".format(j[1], j[2]))
-                        verified_edge.append({i, j[0]})
-
-            dot.render(directory='graph_viz_output', view=True) #this is to print the graph
-
-
-        else: #then we have to simply print the graph
-            for i in self.graph:
-                for j in self.graph[i]: 
-                    if {i, j[0]} not in verified_edge:
-                        dot.edge('{}'.format(i), '{}'.format(j[0]), weight = "{}".format(j[1]), label = "weight = {}\n length = {}".format(j[1], j[2]))
-                        verified_edge.append({i, j[0]})
-            dot.render(directory='graph_viz_output', view=True) #this is to print the graph
-
-
-
-def graph_from_file(filename):
-    """
-    Reads a text file and returns the graph as an object of the Graph class.
+        from visualization import view
+        view(self, node1, node2, k)
 
-    The file should have the following format: 
-        The first line of the file is 'n m'
-        The next m lines have 'node1 node2 power_min dist' or 'node1 node2 power_min' (if dist is missing, it will be set to 1 by default)
-        The nodes (node1, node2) should be named 1..n
-        All values are integers.
+    def to_csr(self):
+        """
+        Converts the graph into a CSRGraph (compact numpy representation).
+        The nodes have to be the integers 1..n ; loops (node, node) are dropped.
 
-    Parameters:
-    -----------
-    filename: str
-        The name of the file
+        Outputs:
+        -----------
+        g_csr: CSRGraph
+            The same graph stored in contiguous arrays
+        """
+        src, dst, power, dist = [], [], [], []
+        for node in self.nodes:
+            for neighbor, power_min, d in self.graph[node]:
+                if node < neighbor: #each edge appears in the adjacency lists of both its ends
+                    src.append(node)
+                    dst.append(neighbor)
+                    power.append(power_min)
+                    dist.append(d)
+        return CSRGraph(max(self.nodes, default=0), src, dst, power, dist)
 
-    Outputs:
-    -----------
-    g: Graph
-        An object of the class Graph with the graph from file_name.
-    """
-    with open(filename, "r") as file:
-        n, m = map(int, file.readline().split())
-        g = Graph(range(1, n+1))
-        for _ in range(m):
-            edge = list(map(int, file.readline().split()))
-            if len(edge) == 3:
-                node1, node2, power_min = edge
-                g.add_edge(node1, node2, power_min) # will add dist=1 by default
-            elif len(edge) == 4:
-                node1, node2, power_min, dist = edge
-                g.add_edge(node1, node2, power_min, dist)
-            else:
-                raise Exception("Format incorrect")
-    return g
 
 
-def kruskal(g):
+class CSRGraph:
     """
-    The aim of this function is to use the kruskal algorithm
-    to find the minimum spanning tree of a given graph.
-    
-    Parameters:
-    -----------
-    g: Graph
-        An object of the class Graph
+    A compact representation of a (non oriented) graph in contiguous numpy arrays,
+    using the compressed sparse row (CSR) format. The nodes are the integers 1..n.
+    The algorithms work on whole arrays (a BFS expands a full level at once) instead of
+    following Python tuples one by one.
 
-    Outputs:
+    Attributes:
     -----------
-    g_mst: Graph
-        An object of the class Graph : the minimum spanning tree of g
+    nb_nodes: int
+        The number of nodes.
+    nb_edges: int
+        The number of edges.
+    src, dst, power, dist: np.ndarray
+        The edges : the i-th edge links src[i] and dst[i], with minimal power power[i]
+        and distance dist[i]
+    offsets: np.ndarray
+        The adjacency of node is stored at positions offsets[node]:offsets[node+1] of
+        the following arrays (each edge appears twice, once for each end)
+    neighbors, powers, dists: np.ndarray
+        The neighbor, minimal power and distance of each adjacency entry
     """
-    #tri des arêtes par ordre croissant de poids
-    set_edges = []
-    for a in g.graph:
-        for j in g.graph[a]:
-            set_edges.append([a, j[0], j[1]])
-    edges=sorted(set_edges,key=lambda x:x[2])
-    #Initialisation of the Union Find Structure. 
-    parent = list(g.nodes)
-    
-    def find(x):
-        #print(x)
-        if parent[x-1]==x:
-            return x
-        parent[x-1]=find(parent[x-1])
-        return parent[x-1]
-
-    def union(x,y):
-        parent[find(x)-1]=find(y)
-    
-    #Minimum weight spanning tree construction
-    g_mst=Graph(list(g.nodes))
-    for u,v,w in edges:
-        if find(u)!=find(v):
-            g_mst.add_edge(u,v,w)
-            union(u,v)
-    return g_mst
 
+    def __init__(self, nb_nodes, src, dst, power, dist=None):
+        """
+        Builds the CSR arrays from the list of edges in O(E log E).
 
-def min_power_for_path(g, source, destination):
-    """
-    Reads a tree and a traject and return the minimal power to do this traject.
-    The input graph has to be a minimum spanning tree.
+        Parameters:
+        -----------
+        nb_nodes: int
+            The number of nodes (the nodes are 1..nb_nodes)
+        src, dst, power: array-like
+            The ends and the minimal power of each edge
+        dist: array-like, optional
+            The distance of each edge. Default is 1 for every edge.
+        """
+        node_type = np.int32 if nb_nodes < 2**31 - 1 else np.int64
+        self.nb_nodes = nb_nodes
+        self.nodes = range(1, nb_nodes + 1)
+        self.src = np.asarray(src, dtype=node_type)
+        self.dst = np.asarray(dst, dtype=node_type)
+        self.power = np.asarray(power)
+        self.dist = np.ones(len(self.src), dtype=np.int64) if dist is None else np.asarray(dist)
+        self.nb_edges = len(self.src)
+
+        heads = np.concatenate([self.src, self.dst])
+        order = np.argsort(heads, kind="stable")
+        self.neighbors = np.concatenate([self.dst, self.src])[order]
+        self.powers = np.concatenate([self.power, self.power])[order]
+        self.dists = np.concatenate([self.dist, self.dist])[order]
+        self.offsets = np.zeros(nb_nodes + 2, dtype=np.int64)
+        np.cumsum(np.bincount(heads, minlength=nb_nodes + 1), out=self.offsets[1:])
+        self._roots = None #see _component_roots
+        self._labels = None #see component_labels
 
-    The complixity is in O(Nlog(N)) N is the number of edges
+    def __str__(self):
+        """Prints the number of nodes and edges of the graph"""
+        return f"The graph has {self.nb_nodes} nodes and {self.nb_edges} edges (CSR format).\n"
 
-    Parameters:
-    -----------
-    g: Graph
-        An object of the class Graph
-    source: NodeType
-        A node
-    destination: NodeType
-        The destination node
+    def _expand(self, frontier):
+        """
+        Returns, for all the adjacency entries of the nodes of frontier, the node they
+        start from and their position in the adjacency arrays.
+        """
+        starts = self.offsets[frontier]
+        counts = self.offsets[frontier + 1] - starts
+        heads = np.repeat(frontier, counts)
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return heads, np.arange(len(heads)) + shift
 
-    Outputs:
-    -----------
-    min_power: int
-        The minimal power required to travel the traject from source to destination
-    """
-    # verify that the given graph is a tree (a minimum spanning tree)
-    """ assert g == kruskal(g), "Warning ! The graph given is not a minimum spanning tree" """
-    #this lign is not working for now we will fix this in the futur
-
-    # initialize the stack of nodes to visit
-    stack = [1]
-
-    # initialize parent dictionary and minimum power
-    dico = dict([(i, [0,0]) for i in g.nodes]) #(parent, profondeur)
-    dico[1] = [None, 0] # type: ignore
-
-    verified = {1}
-    # traverse the spanning tree from the source node (DFS)
-    while stack:
-        node = stack.pop()
-        for neighbor, _, _ in g.graph[node]:
-            if ((dico[neighbor][0] != node) and (dico[neighbor][0] != None) and (neighbor not in verified)):
-                verified.add(neighbor)
-                stack.append(neighbor)
-                dico[neighbor] = [node, dico[node][1]+1]
-                
-
-
-    def find_path(src_, dest_):
-        assert dico[src_][1] == dico[dest_][1]
-        path = []
-        curr1, curr2 = src_, dest_
-        while 1 not in path:
-            path.append(curr1)
-            path.append(curr2)
-            curr1, curr2 = dico[curr1][0], dico[curr2][0]
-        return path
-
-    if dico[source][1] == dico[destination][1]:
-        path = find_path(source, destination)
-    elif dico[source][1]>dico[destination][1]:
-        path_ = []
-        curr = source
-        while dico[curr][1] != dico[destination][1]:
-            path_.append(curr)
-            curr = dico[curr][0]
-        path = path_+find_path(curr, destination)
-    else:
-        path_ = []
-        curr = destination
-        while dico[curr][1] != dico[source][1]:
-            path_.append(curr)
-            curr = dico[curr][0]
-        path = path_+find_path(source, curr)
-
-    min_power = 0
-
-    for i in range(len(path)-1):
-        for j in g.graph[path[i]]:
-            if j[0] in path:
-                if j[1] > min_power:
-                    min_power = j[1]
-    
-    return min_power
+    def _bfs(self, sources, power=None, dest=None):
+        """
+        Breadth-first search from several sources at once, a whole level at a time.
+        Only the edges with a minimal power <= power are used (all of them if power is None).
+        The search stops as soon as dest is reached.
 
+        Outputs:
+        -----------
+        parent: np.ndarray
+            parent[node] is the predecessor of node (node itself for a source, -1 if not reached)
+        parent_power: np.ndarray
+            The minimal power of the edge (parent[node], node)
+        depth: np.ndarray
+            The number of edges between node and its source
+        """
+        sources = np.atleast_1d(np.asarray(sources, dtype=np.int64))
+        parent = np.full(self.nb_nodes + 1, -1, dtype=np.int64)
+        parent_power = np.zeros(self.nb_nodes + 1, dtype=self.powers.dtype)
+        depth = np.zeros(self.nb_nodes + 1, dtype=np.int64)
+        parent[sources] = sources
+        frontier, level = sources, 0
+        while frontier.size and not (dest is not None and parent[dest] != -1):
+            level += 1
+            heads, idx = self._expand(frontier)
+            if power is not None:
+                keep = self.powers[idx] <= power
+                heads, idx = heads[keep], idx[keep]
+            new = parent[self.neighbors[idx]] == -1
+            heads, idx = heads[new], idx[new]
+            frontier, first = np.unique(self.neighbors[idx], return_index=True)
+            parent[frontier] = heads[first]
+            parent_power[frontier] = self.powers[idx[first]]
+            depth[frontier] = level
+        return parent, parent_power, depth
+
+    def _component_roots(self):
+        """
+        Returns an array roots where roots[node] is the smallest node of the connected component
+        of node. The components are found by hooking and pointer jumping on the edge arrays,
+        hence in O(log N) vectorized rounds on usual graphs, and kept for the next calls.
+        """
+        if self._roots is not None:
+            return self._roots
+        roots = np.arange(self.nb_nodes + 1)
+        while True:
+            low, high = roots[self.src], roots[self.dst]
+            differ = low != high
+            if not differ.any():
+                self._roots = roots
+                return roots
+            low, high = np.minimum(low[differ], high[differ]), np.maximum(low[differ], high[differ])
+            np.minimum.at(roots, high, low) #hooking : each root points to a smaller root
+            while True: #pointer jumping : each node points to its root
+                jumped = roots[roots]
+                if np.array_equal(jumped, roots):
+                    break
+                roots = jumped
+
+    def component_labels(self):
+        """
+        Returns the connected components as an array of labels, as Graph.component_labels.
 
-from typing import Any, List
-def route_from_file(filename) -> List[List[int]]:
-    """
-    This function transform a text file in a list of road
+        Outputs:
+        -----------
+        labels: np.ndarray
+            labels[i] is the number (0, 1, ...) of the component of the node self.nodes[i] = i + 1 ;
+            the components are numbered in the order of their first node
+        sizes: np.ndarray
+            sizes[k] is the number of nodes of the component k
+        """
+        if self._labels is None:
+            #the smallest node of a component is its first node, so the sorted roots give the order
+            labels = np.unique(self._component_roots()[1:], return_inverse=True)[1].reshape(-1)
+            self._labels = (labels, np.bincount(labels))
+        return self._labels
 
-    Parameters:
-    -----------
-    filename : txt file
-        A text file with a list of road
+    def same_component(self, a, b):
+        """
+        Returns True if the nodes a and b are in the same connected component.
+        O(1) once the components are computed.
+        """
+        roots = self._component_roots()
+        return roots[a] == roots[b]
 
-    Outputs:
-    -----------
-    route : List[List[int]]
-        A list of roads : city1 city2 utility
-    """
+    def connected_components(self):
+        """
+        Returns the list of the connected components (one list of nodes per component)
+        """
+        labels = self.component_labels()[0]
+        order = np.argsort(labels, kind="stable")
+        cuts = np.flatnonzero(np.diff(labels[order])) + 1
+        return [list(component + 1) for component in np.split(order, cuts)] if self.nb_nodes else []
 
-    route = []
-    with open(filename, "r") as file:
-        n = list(map(int, file.readline().split()))[0]
-        for _ in range(n):
-            _tmp = list(map(int, file.readline().split()))
-            route.append(_tmp)
-    return route
+    def connected_components_set(self):
+        """
+        The result should be a set of frozensets (one per component), as for Graph
+        """
+        return set(map(frozenset, self.connected_components()))
 
+    def _path_to(self, parent, dest):
+        """Reconstructs the path from the source of a BFS to dest using the parent array"""
+        path = [dest]
+        while parent[path[-1]] != path[-1]:
+            path.append(parent[path[-1]].item())
+        return path[::-1]
 
-def truck_from_file(filename) -> List[List[int]]:
-    """
-    This function transform a text file in a list of truck
+    def get_path_with_power(self, src, dest, power):
+        """
+        Returns a path from src to dest using only edges with a minimal power <= power,
+        or None if there is no such path. The path returned has the fewest edges.
+        The complexity is O(V+E).
 
-    Parameters:
-    -----------
-    filename : txt file
-        A text file with a list of trucks
+        Parameters:
+        -----------
+        src : NodeType
+            First node of the traject
+        dest : NodeType
+            Last node of the traject
+        power : numeric (int or float)
+            Power to test
+        """
+        parent, _, _ = self._bfs(src, power, dest)
+        if parent[dest] == -1:
+            return None
+        return self._path_to(parent, dest)
 
-    Outputs:
-    -----------
-    route : List[List[int]]
-        A list of trucks : power cost
-    """
+    def min_power(self, src, dest):
+        """
+        Returns path, min_power for the traject between src and dest, as Graph.min_power.
+        The binary search is done on the sorted distinct powers of the edges, hence the result
+        is exact. The complexity is O(E log E).
 
-    truck = []
-    with open(filename, "r") as file:
-        n = list(map(int, file.readline().split()))[0]
-        for _ in range(n):
-            _tmp = list(map(int, file.readline().split()))
-            truck.append(_tmp)
-    return truck
+        Parameters:
+        -----------
+        src : NodeType
+            Source :A node of the graph
+        dest : NodeType
+            Destination : Another node of the graph
 
+        Outputs:
+        -----------
+        path : list
+            The path between src and dest that costs the minimum power
+        power : int
+            The minimum power required to travel the traject between src and dest
+        """
+        if src == dest:
+            return [src], 0
+        if not self.same_component(src, dest):
+            raise ValueError("The two given nodes are not in the same connected component.")
+        powers = np.unique(self.power)
+        a, b = 0, len(powers) - 1 #powers[b] is always enough
+        while a < b:
+            middle = (a + b) // 2
+            if self._bfs(src, powers[middle], dest)[0][dest] != -1:
+                b = middle
+            else:
+                a = middle + 1
+        return self.get_path_with_power(src, dest, powers[b]), powers[b].item()
 
-def assign_trucks_to_routes(graph, route_file, trucks_file):
-    """
-    This function assign a truck to a road in the optimal (heuristical) solution
+    def minimum_spanning_tree(self):
+        """
+        Returns the minimum spanning tree (forest) of the graph as a CSRGraph, with the
+        Kruskal algorithm (see kruskal_edges).
+        """
+        kept = kruskal_edges(self.nb_nodes, self.src, self.dst, self.power)
+        return CSRGraph(self.nb_nodes, self.src[kept], self.dst[kept], self.power[kept], self.dist[kept])
 
-    Parameters:
-    -----------
-    graph : a Graph
-        A graph
-    
-    route_file : txt file
-        A text file with a list of road
 
-    trucks_file : txt file
-        A text file with a list of trucks
 
-    Outputs:
+class UnionFind:
+    """
+    A union-find (disjoint set) structure on the nodes 0..n, with union by size and
+    iterative path compression (no recursion, hence no recursion limit on long chains).
+
+    Attributes:
     -----------
-    truck_assignments : List
-        A list of tuples (truck (= power and cost), road)
-    total_profit : Float
-        A float which is the total of the profit
+    parent: list
+        parent[x] is the parent of x in its tree (x itself for a representative)
+    size: list
+        size[x] is the number of nodes in the tree of x, if x is a representative
     """
 
-    routes = route_from_file(route_file)
-    trucks = truck_from_file(trucks_file)
-    mst = kruskal(graph)
+    def __init__(self, n):
+        self.parent = list(range(n + 1))
+        self.size = [1] * (n + 1)
 
-    min_powers = []
-    for src, dest, profit in routes:
-        min_power = min_power_for_path(mst, src, dest)
-        min_powers.append((src, dest, profit, min_power))
+    def find(self, x):
+        """Returns the representative of the set of x"""
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
 
-    truck_assignments, total_profit = greedy_knapsack(trucks, min_powers)
+    def union(self, x, y):
+        """
+        Merges the sets of x and y. Returns False if they were already in the same set,
+        True otherwise.
+        """
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        if self.size[x] < self.size[y]:
+            x, y = y, x
+        self.parent[y] = x
+        self.size[x] += self.size[y]
+        return True
 
-    return truck_assignments, total_profit
 
-def greedy_knapsack(trucks, min_powers):
+def kruskal_edges(nb_nodes, src, dst, power):
     """
-    This is the implementation of a greedy method in order to solve the knapsack problem
-    (adapted to our subject)
+    Kruskal algorithm on arrays of edges : the edges are sorted by power with numpy (stable sort,
+    so ties are kept in the given order) and then added with a union-find until the
+    tree has n-1 edges. The complexity is O(E log E).
 
     Parameters:
-    -----------    
-    trucks : list
-        A list of trucks : power cost
-
-    min_power : List[tuples]
-        A list of tuples with 
-        (city1, city2, profit, minimal power to travel the road)
+    -----------
+    nb_nodes: int
+        The number of nodes (the nodes are 1..nb_nodes)
+    src, dst, power: np.ndarray
+        The ends and the minimal power of each edge
 
     Outputs:
     -----------
-    truck_assignments : List
-        A list of tuples (truck (= power and cost), road)
-    total_profit : Float
-        A float which is the total of profit
+    kept: np.ndarray
+        The indices of the edges of the minimum spanning tree (forest), by increasing power
     """
-    
-    sorted_min_powers = sorted(min_powers, key=lambda x: x[2] / x[3], reverse=True)
-    sorted_trucks = sorted(trucks, key=lambda x: x[1], reverse=True)
-    Bu = 25e9
-
-    truck_assignments = []
-    total_profit = 0
-
-    for src, dest, profit, min_power in sorted_min_powers:
-        for idx, truck in enumerate(sorted_trucks):
-            if (truck[0] >= min_power) and (Bu - truck[1]>=0):
-                Bu -= truck[1]
-                truck_assignments.append((truck, (src, dest)))
-                total_profit += profit
-                sorted_trucks.pop(idx)
+    order = np.argsort(power, kind="stable")
+    components = UnionFind(nb_nodes)
+    kept = []
+    scanned = 0
+    for scanned, (edge, u, v) in enumerate(zip(order.tolist(), src[order].tolist(), dst[order].tolist()), 1):
+        if components.union(u, v):
+            kept.append(edge)
+            if len(kept) == nb_nodes - 1:
                 break
-
-    return truck_assignments, total_profit
+    count("kruskal.edges_scanned", scanned)
+    count("kruskal.finds", 2 * scanned)
+    count("kruskal.unions", len(kept))
+    return np.array(kept, dtype=np.int64)
 
 
-#We will now build an exact method in order to find the exact optimum
-# The name of the method is Branch&Bounds
-import numpy as np
-
-def bound(node, n, W, items):
+def kruskal(g):
     """
-    This function compute for each node a bound for the further branch.
-    This allows us to dramatically reduce the compute time
-
+    The aim of this function is to use the kruskal algorithm
+    to find the minimum spanning tree of a given graph.
+    The edges are sorted with numpy and merged with an iterative union-find
+    (see kruskal_edges), hence the complexity is O(E log E) with no recursion.
+    
     Parameters:
     -----------
-    node : NodeType
-        A node of the graph
-    
-    n : int
-        number of items
-    
-    W : int
-        maximum weight
-
-    items : list
-        A list of items that we can put in the knapsack : 
-        for each road we took the less costly truck that can travel the road
-        An item is each time the utility and the cost
+    g: Graph
+        An object of the class Graph (or CSRGraph)
 
     Outputs:
     -----------
-    profit_bound: Float
-        the highest profit we can get
+    g_mst: Graph
+        An object of the class Graph : the minimum spanning tree of g
+        (a CSRGraph if g is a CSRGraph)
     """
-    if node[1] > W:
-        return 0
-
-    # initialize profit bound to profit of current node
-    profit_bound = node[2]
+    with stage("kruskal"):
+        if isinstance(g, CSRGraph):
+            return g.minimum_spanning_tree()
+        #each edge is kept once, under the end that comes first in g.graph (the order of the
+        #former implementation, so that ties between equal powers are broken in the same way)
+        rank = dict((node, i) for i, node in enumerate(g.graph))
+        nodes = list(g.graph)
+        src, dst, power, dist = [], [], [], []
+        for a in g.graph:
+            for neighbor, power_min, d in g.graph[a]:
+                if rank[a] < rank[neighbor]:
+                    src.append(rank[a])
+                    dst.append(rank[neighbor])
+                    power.append(power_min)
+                    dist.append(d)
+
+        #tri des arêtes par ordre croissant de poids (numpy) and union-find by size
+        kept = kruskal_edges(len(nodes), np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64), np.array(power))
+
+        #Minimum weight spanning tree construction
+        g_mst = Graph(list(g.nodes))
+        for edge in kept.tolist():
+            g_mst.add_edge(nodes[src[edge]], nodes[dst[edge]], power[edge], dist[edge])
+        return g_mst
+
+
+def min_power_for_path(g, source, destination, return_path=False):
+    """
+    Reads a tree and a traject and return the minimal power to do this traject.
+    The input graph has to be a minimum spanning tree (or forest), e.g. the output of kruskal.
 
-    # start from the next item index
-    j = node[0] + 1
+    The tree is rooted once (one root per connected component, see Graph._rooted_forest) and kept
+    until the tree changes ; then both ends walk up to their lowest common ancestor, keeping the
+    maximal power of the edges met. The complexity is O(N) for the first query on a tree and
+    O(length of the path) for the next ones.
 
-    # keep adding items until weight limit is reached or all items are added
-    while j < n and node[1] + items[j][0] <= W:
-        node = [j, node[1] + items[j][0], node[2] + items[j][1], node[3]]
-        profit_bound += items[j][1]
-        j += 1
+    Parameters:
+    -----------
+    g: Graph
+        An object of the class Graph, a tree or a forest
+    source: NodeType
+        A node
+    destination: NodeType
+        The destination node
+    return_path: bool, optional
+        Also return the path and its bottleneck edge. Default is False.
 
-    # if not all items are added, calculate the fractional profit of the next item
-    if j < n:
-        # calculate the remaining weight
-        remaining_weight = W - node[1]
-        # add the fraction of profit based on the remaining weight and the next item's value-to-weight ratio
-        profit_bound += remaining_weight * items[j][1] / items[j][0]
+    Outputs:
+    -----------
+    min_power: int
+        The minimal power required to travel the traject from source to destination
+    path: list
+        (only if return_path) The nodes of the path from source to destination in the tree
+    bottleneck: tuple
+        (only if return_path) The edge (node1, node2, power) of the path with the maximal power,
+        None if source == destination
+    """
+    parent, depth, root = g._rooted_forest()
+    if root[source] != root[destination]:
+        raise ValueError("The two given nodes are not in the same connected component.")
+    bottleneck = None
+    up, down = [source], [destination] #the two halves of the path, up to the common ancestor
+    while up[-1] != down[-1]:
+        side = up if depth[up[-1]] >= depth[down[-1]] else down
+        node = side[-1]
+        above, power = parent[node]
+        if bottleneck is None or power > bottleneck[2]:
+            bottleneck = (node, above, power)
+        side.append(above)
+    count("min_power_for_path.steps", len(up) + len(down) - 2)
+    min_power = 0 if bottleneck is None else bottleneck[2]
+    if return_path:
+        return min_power, up + down[-2::-1], bottleneck
+    return min_power
 
-    return profit_bound
 
-def knapsack(budget, items):
+class MinPowerTree:
     """
-    This is an implementation of the branch and bounds algorithm in order to solve the 
-    knapsack problem (adapted for our problem)
+    A query structure built once from a minimum spanning tree that answers the minimal power
+    of many trajects, using binary lifting.
 
-    Parameters:
-    -----------
-    budget : float
-        the total budget
-    
-    items : list
-        A list of items that we can put in the knapsack : 
-        for each road we took the less costly truck that can travel the road
-        An item is each time the utility and the cost
+    For each node we store its depth, its 2^k-th ancestor and the maximal power on the 2^k edges
+    above it. A query lifts both ends to their lowest common ancestor in O(log N) and the answer
+    is the maximal power met on the way.
+    The nodes are assumed to be the integers 1..n (as given by graph_from_file).
 
-    Outputs:
+    Attributes:
     -----------
-    max_profit: Float
-        the highest profit we can get
+    depth: np.ndarray
+        depth[node] is the depth of node in its tree
+    root: np.ndarray
+        root[node] is the root of the tree (connected component) containing node
+    up: list of np.ndarray
+        up[k][node] is the 2^k-th ancestor of node (a root is its own ancestor)
+    max_power: list of np.ndarray
+        max_power[k][node] is the maximal power on the 2^k edges above node
     """
 
-    n = len(items)
-    items = sorted(items, key=lambda x: x[1] / x[0], reverse=True)
-    queue = []
-    #print(items)
+    def __init__(self, mst):
+        """
+        Builds the tables with a BFS from one root per connected component.
+        The complexity is O(N log N).
 
-    node = (-1, 0, 0, 0)
-    queue.append(node)
+        Parameters:
+        -----------
+        mst: Graph or CSRGraph
+            A minimum spanning tree (or forest), e.g. the output of kruskal
+        """
+        with stage("MinPowerTree"):
+            if isinstance(mst, Graph):
+                mst = mst.to_csr()
+            self.root = mst._component_roots()
+            parent, parent_power, self.depth = mst._bfs(np.flatnonzero(self.root == np.arange(len(self.root))))
+            self.up = [parent]
+            self.max_power = [parent_power]
+            for _ in range(1, max(1, int(self.depth.max()).bit_length())):
+                prev_up, prev_max = self.up[-1], self.max_power[-1]
+                self.up.append(prev_up[prev_up])
+                self.max_power.append(np.maximum(prev_max, prev_max[prev_up]))
+
+    def component_size(self, node):
+        """Returns the number of nodes of the tree of node (0 if node is not in the tables)"""
+        if not 0 <= node < len(self.root):
+            return 0
+        return int(np.count_nonzero(self.root == self.root[node]))
+
+    def is_ancestor(self, ancestor, node):
+        """Returns True if node is in the subtree of ancestor (node itself included), in O(log N)"""
+        if self.root[ancestor] != self.root[node] or self.depth[node] < self.depth[ancestor]:
+            return False
+        diff, k = int(self.depth[node] - self.depth[ancestor]), 0
+        while diff:
+            if diff & 1:
+                node = self.up[k][node]
+            diff >>= 1
+            k += 1
+        return node == ancestor
+
+    def rehang(self, tree, start, above=None, power=0):
+        """
+        Updates the tables after a change of the tree that only moved one part of it : the nodes
+        of the part of start are hung again from start, which is linked to above by an edge of the
+        given power (start is a new root if above is None). The other nodes keep their ancestors,
+        so only the part is updated, in O(size of the part * log N).
 
-    max_profit = 0
+        Parameters:
+        -----------
+        tree: Graph
+            The tree after the change, in which the only edge leaving the part is (start, above)
+        start: int
+            The node of the part linked to the rest of the tree
+        above: int, optional
+            The node of the rest of the tree linked to start. Default is None (a new tree).
+        power: numeric, optional
+            The minimal power of the edge (start, above)
 
-    while queue:
-        node = queue.pop(0)
-        node2 = [0, 0, 0, 0]
+        Outputs:
+        -----------
+        updated: bool
+            False if the tables can not be updated (a node out of the tables) : they have to be
+            built again
+        """
+        nodes, parents, powers = [start], [start if above is None else above], [power]
+        seen = {start} if above is None else {start, above}
+        sizes = [1] #the number of nodes at each depth under start
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbor, power_min, _ in tree.graph[node]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+                        parents.append(node)
+                        powers.append(power_min)
+            nodes += next_frontier
+            if next_frontier:
+                sizes.append(len(next_frontier))
+            frontier = next_frontier
+        if max(max(nodes), parents[0]) >= len(self.root):
+            return False
+        first_depth = 0 if above is None else int(self.depth[above]) + 1
+        count("min_power_tree.rehung_nodes", len(nodes))
+
+        nodes = np.array(nodes)
+        powers = np.asarray(powers)
+        dtype = np.result_type(self.max_power[0], powers)
+        if dtype != self.max_power[0].dtype: #e.g. a float power in tables built from integer powers
+            self.max_power = [level.astype(dtype) for level in self.max_power]
+        self.root[nodes] = start if above is None else self.root[above]
+        self.depth[nodes] = first_depth + np.repeat(np.arange(len(sizes)), sizes)
+        self.up[0][nodes] = parents
+        self.max_power[0][nodes] = powers
+        for k in range(1, len(self.up)): #the level k of a node only needs the level k-1 of all the nodes
+            middle = self.up[k-1][nodes]
+            self.up[k][nodes] = self.up[k-1][middle]
+            self.max_power[k][nodes] = np.maximum(self.max_power[k-1][nodes], self.max_power[k-1][middle])
+        while first_depth + len(sizes) > 1 << len(self.up): #the tree got deeper : one more level for all the nodes
+            prev_up, prev_max = self.up[-1], self.max_power[-1]
+            self.up.append(prev_up[prev_up])
+            self.max_power.append(np.maximum(prev_max, prev_max[prev_up]))
+        return True
+
+    def query(self, src, dest):
+        """
+        Returns the minimal power to travel the traject between src and dest in O(log N).
 
-        if node[0] == -1:
-            node2 = [0, 0, 0, 0]
-            #v_level = 0
-        elif node[0] == n-1:
-            continue
-        else:
-            node2[0] = node[0] + 1
+        Parameters:
+        -----------
+        src : NodeType
+            A node of the tree
+        dest : NodeType
+            Another node of the tree
 
-        
-        node2 = [node2[0], node[1] + items[node2[0]][0], node[2] + items[node2[0]][1], 0]
+        Outputs:
+        -----------
+        min_power : int
+            The maximal power on the path between src and dest in the tree
+        """
+        if self.root[src] != self.root[dest]:
+            raise ValueError("The two given nodes are not in the same connected component.")
+        if self.depth[src] < self.depth[dest]:
+            src, dest = dest, src
+        min_power = 0
+        diff = int(self.depth[src] - self.depth[dest])
+        k = 0
+        while diff:
+            if diff & 1:
+                min_power = max(min_power, self.max_power[k][src])
+                src = self.up[k][src]
+            diff >>= 1
+            k += 1
+        if src != dest:
+            for k in reversed(range(len(self.up))):
+                if self.up[k][src] != self.up[k][dest]:
+                    min_power = max(min_power, self.max_power[k][src], self.max_power[k][dest])
+                    src, dest = self.up[k][src], self.up[k][dest]
+            min_power = max(min_power, self.max_power[0][src], self.max_power[0][dest])
+        return min_power.item() if isinstance(min_power, np.generic) else min_power
+
+    def query_many(self, pairs):
+        """
+        Vectorized version of query : answers all the trajects at once, in O(T log N) numpy operations.
 
-        if node2[1] <= budget and node2[2] > max_profit:
-            max_profit = node2[2]
+        Parameters:
+        -----------
+        pairs : array-like
+            A list of trajects (src, dest) ; extra columns (e.g. the utility of a line of
+            route_from_file) are ignored
+
+        Outputs:
+        -----------
+        min_powers : np.ndarray
+            min_powers[i] is the minimal power of the i-th traject
+        """
+        pairs = np.asarray(pairs)
+        if pairs.size == 0:
+            return np.zeros(0, dtype=self.max_power[0].dtype)
+        src, dest = pairs[:, 0], pairs[:, 1]
+        if np.any(self.root[src] != self.root[dest]):
+            raise ValueError("The two given nodes are not in the same connected component.")
+        swap = self.depth[src] < self.depth[dest]
+        a, b = np.where(swap, dest, src), np.where(swap, src, dest)
+        min_powers = np.zeros(len(a), dtype=self.max_power[0].dtype)
+
+        #lift the deepest node of each pair to the depth of the other one
+        diff = self.depth[a] - self.depth[b]
+        for k in range(len(self.up)):
+            jump = ((diff >> k) & 1).astype(bool)
+            min_powers[jump] = np.maximum(min_powers[jump], self.max_power[k][a[jump]])
+            a[jump] = self.up[k][a[jump]]
+
+        #lift both nodes just under their lowest common ancestor
+        for k in reversed(range(len(self.up))):
+            move = self.up[k][a] != self.up[k][b]
+            step = np.maximum(self.max_power[k][a], self.max_power[k][b])
+            min_powers = np.where(move, np.maximum(min_powers, step), min_powers)
+            a, b = np.where(move, self.up[k][a], a), np.where(move, self.up[k][b], b)
+
+        last = a != b
+        step = np.maximum(self.max_power[0][a], self.max_power[0][b])
+        return np.where(last, np.maximum(min_powers, step), min_powers)
+
+
+def min_powers_for_routes(graph, routes):
+    """
+    Returns the minimal power of every route at once, without building any path (offline algorithm).
 
-        node2_bound = bound(node2, n, budget, items)
+    The minimal power of a route is the power of the edge which, in the Kruskal order, connects
+    its two cities. So we run the union-find of Kruskal again on the edges of the minimum spanning
+    tree (sorted by power) : each component keeps the list of the routes still waiting with one
+    end inside it, and when two components are merged we go through the smaller list only
+    (a route moves O(log T) times). The complexity is O((E + T log T) log E).
 
-        if node2_bound > max_profit:
-            node2 = [node2[0], node2[1], node2[2], node2_bound]
-            queue.append(node2)
+    Parameters:
+    -----------
+    graph: Graph or CSRGraph
+        The graph (not necessarily a tree)
+    routes: array-like
+        A list of routes (city1, city2, ...) ; extra columns are ignored
 
-        node2 = (node[0] + 1, node[1], node[2], bound((node[0] + 1, node[1], node[2], 0), n, budget, items))
-        if node2[3] > max_profit:
-            queue.append(node2)
+    Outputs:
+    -----------
+    min_powers: np.ndarray
+        min_powers[i] is the minimal power of the i-th route
+    """
+    if isinstance(graph, Graph):
+        graph = graph.to_csr()
+    routes = np.asarray(routes)
+    src, dest = (routes[:, 0].tolist(), routes[:, 1].tolist()) if routes.size else ([], [])
+    min_powers = np.zeros(len(src), dtype=graph.power.dtype)
+    answered = [a == b for a, b in zip(src, dest)]
+    waiting = [[] for _ in range(graph.nb_nodes + 1)] #waiting[root] : routes with one end in the component
+    for route, (a, b) in enumerate(zip(src, dest)):
+        if not answered[route]:
+            waiting[a].append(route)
+            waiting[b].append(route)
+
+    kept = kruskal_edges(graph.nb_nodes, graph.src, graph.dst, graph.power)
+    components = UnionFind(graph.nb_nodes)
+    for u, v, power in zip(graph.src[kept].tolist(), graph.dst[kept].tolist(), graph.power[kept].tolist()):
+        u, v = components.find(u), components.find(v)
+        big, small = (u, v) if len(waiting[u]) >= len(waiting[v]) else (v, u)
+        merged = waiting[big]
+        for route in waiting[small]:
+            if answered[route]:
+                continue
+            if components.find(src[route]) == big or components.find(dest[route]) == big:
+                answered[route] = True
+                min_powers[route] = power
+            else:
+                merged.append(route)
+        components.union(u, v)
+        waiting[u], waiting[v] = [], []
+        waiting[components.find(u)] = merged
 
-    return max_profit
+    if not all(answered):
+        raise ValueError("The two given nodes are not in the same connected component.")
+    return min_powers
 
 
-def wrapper(graph: Graph, route_file, trucks_file):
+class PowerThresholdIndex:
     """
-    This is a wrapp function, no need to explain
+    An index built once from a graph that answers "can a truck of power P go from A to B ?"
+    in O(log N), without any search in the graph.
+
+    It is the Kruskal reconstruction tree : the leaves are the nodes 1..n of the graph, and each
+    edge of the minimum spanning tree (taken by increasing power) creates a new internal node,
+    whose two children are the current components of its two ends and whose weight is the power
+    of the edge. The weights increase from the leaves to the root, so the component of a node
+    for a power P is its highest ancestor of weight <= P, found by binary lifting.
+    The methods accept numbers or numpy arrays (broadcast together) of queries.
+
+    Attributes:
+    -----------
+    nb_nodes: int
+        The number of nodes of the graph (leaves 1..n, internal nodes n+1, ...)
+    weight: np.ndarray
+        weight[x] is the power of the edge that created the internal node x
+    up: list of np.ndarray
+        up[k][x] is the 2^k-th ancestor of x in the tree (a root is its own ancestor)
+    first, count: np.ndarray
+        The nodes of the component x are leaves[first[x]:first[x]+count[x]]
+    leaves: np.ndarray
+        The nodes of the graph, ordered so that every component is contiguous
     """
 
-    g = kruskal(graph)
+    def __init__(self, graph):
+        """
+        Builds the tree in O(E log E) and the lifting tables in O(N log N).
 
-    routes = route_from_file(route_file)
-    trucks = truck_from_file(trucks_file)
+        Parameters:
+        -----------
+        graph: Graph or CSRGraph
+            The graph (the nodes are assumed to be the integers 1..n)
+        """
+        if isinstance(graph, Graph):
+            graph = graph.to_csr()
+        n = self.nb_nodes = graph.nb_nodes
+        kept = kruskal_edges(n, graph.src, graph.dst, graph.power)
+        size = n + 1 + len(kept)
+        parent = list(range(size))
+        children = []
+        components = UnionFind(n)
+        top = list(range(n + 1)) #top[root] : the node of the tree for the component of root
+        for new, (u, v) in enumerate(zip(graph.src[kept].tolist(), graph.dst[kept].tolist()), start=n+1):
+            u, v = components.find(u), components.find(v)
+            parent[top[u]] = parent[top[v]] = new
+            children.append((top[u], top[v]))
+            components.union(u, v)
+            top[components.find(u)] = new
+
+        #number of leaves under each node (children are created before their parent)
+        count = [1] * (n + 1) + [0] * len(kept)
+        for new, (a, b) in enumerate(children, start=n+1):
+            count[new] = count[a] + count[b]
+        #position of the first leaf of each node, the roots one after the other
+        first = [0] * size
+        offset = 0
+        for x in range(1, size):
+            if parent[x] == x:
+                first[x] = offset
+                offset += count[x]
+        for new in range(size - 1, n, -1):
+            a, b = children[new - n - 1]
+            first[a], first[b] = first[new], first[new] + count[a]
+
+        self.count = np.array(count)
+        self.first = np.array(first)
+        self.leaves = np.zeros(n, dtype=np.int64)
+        self.leaves[self.first[1:n+1]] = np.arange(1, n + 1)
+        self.weight = np.zeros(size, dtype=graph.power.dtype)
+        self.weight[n+1:] = graph.power[kept]
+        self.up = [np.array(parent)]
+        for _ in range(1, max(1, size.bit_length())):
+            self.up.append(self.up[-1][self.up[-1]])
+
+    def component_at_power(self, node, power):
+        """
+        Returns the component of node in the graph restricted to the edges of minimal power <= power,
+        as a node of the tree (two nodes are connected iff they have the same component).
+        The complexity is O(log N) per query.
 
-    budget = 25*(10**9)
-    summary_of_pb = []
-    for road in routes:
-        power_min = min_power_for_path(g, road[0], road[1])
-        summary_of_pb.append([sorted([a for a in trucks if a[0] >= power_min], key=lambda x: x[1], reverse = False)[0][1], road[2]])
-    
-    n = len(summary_of_pb)
-    #print(summary_of_pb)
+        Parameters:
+        -----------
+        node : int or np.ndarray
+            A node (or an array of nodes) of the graph
+        power : numeric or np.ndarray
+            The power of the truck (or an array of powers)
 
-    return knapsack(budget, summary_of_pb)
+        Outputs:
+        -----------
+        component : int or np.ndarray
+            The component, to be compared with others or given to component_nodes
+        """
+        x, power = np.broadcast_arrays(np.asarray(node), np.asarray(power))
+        for k in reversed(range(len(self.up))):
+            ancestor = self.up[k][x]
+            x = np.where(self.weight[ancestor] <= power, ancestor, x)
+        return x.item() if x.ndim == 0 else x
 
+    def can_travel(self, src, dest, power):
+        """
+        Returns True if a truck of the given power can travel from src to dest, in O(log N).
+        With arrays, returns an array of booleans (e.g. src[:, None], dest[:, None] and
+        powers[None, :] give the feasibility matrix of routes x trucks).
+
+        Parameters:
+        -----------
+        src : int or np.ndarray
+            First node of the traject
+        dest : int or np.ndarray
+            Last node of the traject
+        power : numeric or np.ndarray
+            Power of the truck
+        """
+        same = np.asarray(self.component_at_power(src, power)) == np.asarray(self.component_at_power(dest, power))
+        return same.item() if same.ndim == 0 else same
+
+    def component_nodes(self, component):
+        """
+        Returns the list of the nodes of a component given by component_at_power.
+        """
+        return self.leaves[self.first[component]:self.first[component] + self.count[component]].tolist()
 
 
+#the functions moved to the other modules, imported when they are first accessed
+_MOVED = {"loader": ["graph_from_file", "csr_graph_from_file", "route_from_file", "truck_from_file"],
+          "solvers": ["TruckCatalogue", "assign_trucks_to_routes", "AvailableTrucks", "greedy_knapsack",
+                      "bound", "knapsack", "knapsack_dp", "wrapper"]}
 
-####################################################################################################################################################################################
-##                   test (this section is to execute all the functions)
-####################################################################################################################################################################################
-g = graph_from_file("input/network.1.in")
-route = route_from_file("input/routes.1.in")
-truck = truck_from_file("input/trucks.0.in")
-#g = kruskal(g)
 
-#print(assign_trucks_to_routes(g, "input/routes.1_2.in", "input/trucks.0.in"))
-#g = kruskal(g)
-#assign_trucks_to_routes(g, )
-#print(min_power_for_path(g, 5, 4))
-#print(g.min_power(20, 19))
-#print(wrapper(g, "input/routes.1_2.in", "input/trucks.0.in"))
-g.view(1, 3)
\ No newline at end of file
+def __getattr__(name):
+    for module, names in _MOVED.items():
+        if name in names:
+            return getattr(__import__(module), name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
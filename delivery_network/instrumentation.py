@@ -0,0 +1,136 @@
+"""
+Instrumentation of the solvers : where does the time go in wrapper or assign_trucks_to_routes ?
+
+    import instrumentation
+    instrumentation.enable(memory=True)
+    wrapper(g, "input/routes.1.in", "input/trucks.1.in")
+    instrumentation.export_json("stats.json")
+
+The functions of the project record
+    - stages (with stage("kruskal"): ...) : number of calls, total time and peak memory (with
+      tracemalloc, only if enable(memory=True) since tracing slows down the code)
+    - counters (count("knapsack.nodes_expanded", n)) : nodes visited by the searches, nodes expanded
+      and pruned by the branch and bound, edges scanned and unions by kruskal, ...
+The counters are added once per call (not once per loop iteration), and when the instrumentation
+is disabled (the default) stage returns a shared empty context and count returns at once, so the
+cost is a function call per solver call.
+
+profile(filename) is a separate switch which runs cProfile and writes its report.
+"""
+import contextlib
+import json
+import time
+import tracemalloc
+
+enabled = False
+timers = {} #name -> {"calls", "seconds", "peak_memory"}
+counters = {} #name -> value
+_memory = False
+_open_peaks = [] #the peak memory of the stages in progress (see _Stage)
+_NO_STAGE = contextlib.nullcontext()
+
+
+def enable(memory=False):
+    """Starts recording the stages and the counters (and the peak memory if memory is True)"""
+    global enabled, _memory
+    enabled = True
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable():
+    """Stops recording (the results are kept until reset)"""
+    global enabled, _memory
+    if _memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    enabled = _memory = False
+
+
+def reset():
+    """Forgets the results recorded so far"""
+    timers.clear()
+    counters.clear()
+
+
+def count(name, value=1):
+    """Adds value to the counter name"""
+    if enabled:
+        counters[name] = counters.get(name, 0) + value
+
+
+class _Stage:
+    """
+    Times a block of code. The peak memory of a stage includes the one of the stages run inside
+    it : the peak of tracemalloc is reset at the start of each stage and passed to the enclosing
+    stage at its end.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if _memory:
+            if _open_peaks:
+                _open_peaks[-1] = max(_open_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            _open_peaks.append(0)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        timer = timers.setdefault(self.name, {"calls": 0, "seconds": 0.0, "peak_memory": 0})
+        timer["calls"] += 1
+        timer["seconds"] += seconds
+        if _memory and _open_peaks:
+            peak = max(_open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+            timer["peak_memory"] = max(timer["peak_memory"], peak)
+            if _open_peaks:
+                _open_peaks[-1] = max(_open_peaks[-1], peak)
+
+
+def stage(name):
+    """
+    Returns a context manager recording the time (and the peak memory) of a block of code :
+
+        with stage("kruskal"):
+            mst = kruskal(g)
+    """
+    return _Stage(name) if enabled else _NO_STAGE
+
+
+def report():
+    """
+    Returns the results as a dictionary (ready for json) :
+    {"stages": {name: {"calls", "seconds", "peak_memory_mb"}}, "counters": {name: value}}
+    """
+    stages = dict((name, {"calls": timer["calls"], "seconds": timer["seconds"],
+                          "peak_memory_mb": timer["peak_memory"] / 1e6 if timer["peak_memory"] else None})
+                  for name, timer in timers.items())
+    return {"stages": stages, "counters": dict(counters)}
+
+
+def export_json(filename):
+    """Writes report() in a JSON file"""
+    with open(filename, "w") as file:
+        json.dump(report(), file, indent=2)
+
+
+@contextlib.contextmanager
+def profile(filename, sort="cumulative", limit=40):
+    """
+    Runs the block of code under cProfile : the raw statistics are written in filename (to be
+    read with pstats) and the limit most expensive functions in filename + ".txt".
+    """
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(filename)
+        with open(filename + ".txt", "w") as file:
+            pstats.Stats(profiler, stream=file).sort_stats(sort).print_stats(limit)
@@ -0,0 +1,24 @@
+"""
+Lazy imports : lazy_import("numpy") returns the module at once, but numpy is only really loaded
+at the first use of one of its attributes. So importing graph, loader or solvers takes a few
+milliseconds, and a program (or a worker process) which does not need numpy never loads it.
+"""
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Returns the module name, loaded at its first use (importlib.util.LazyLoader).
+    If the module is already imported, it is returned as is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError("No module named {}".format(name))
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
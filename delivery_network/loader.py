@@ -0,0 +1,333 @@
+"""
+Fast readers for the network.x.in, routes.x.in and trucks.x.in files.
+
+Each file is read at once and parsed into a numpy array of integers (instead of one readline()
+and one map(int, ...) per line). If cache=True, the arrays are also saved in a sidecar file
+filename + ".npz", which is reused as long as the size and modification time of the text file
+have not changed, so the next runs load in a few milliseconds.
+
+For files too big for the memory, iter_routes reads a routes file chunk by chunk and ResultWriter
+writes the results from a background thread.
+
+graph_from_file, csr_graph_from_file, route_from_file and truck_from_file build the objects used
+by the rest of the project from these arrays.
+"""
+import gc
+import itertools
+import os
+import queue
+import threading
+import warnings
+from typing import List
+from instrumentation import stage
+from lazy import lazy_import
+from graph import Graph, CSRGraph
+
+np = lazy_import("numpy")
+
+
+def read_ints(filename):
+    """
+    Returns all the integers of a text file (separated by spaces or new lines) as a numpy array.
+
+    Parameters:
+    -----------
+    filename: str
+        The name of the file
+
+    Outputs:
+    -----------
+    values: np.ndarray
+        The integers of the file, in order
+    """
+    with open(filename, "rb") as file:
+        return _parse_ints(file.read())
+
+
+def _parse_ints(data):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning) #numpy only warns on a non integer token
+        try:
+            return np.fromstring(data, dtype=np.int64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            raise Exception("Format incorrect")
+
+
+def _cached(filename, parse, cache):
+    """
+    Returns parse(filename) (a dict of arrays), going through the sidecar cache if cache is True.
+    """
+    if not cache:
+        return parse(filename)
+    stat = os.stat(filename)
+    key = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    cache_file = filename + ".npz"
+    if os.path.isfile(cache_file):
+        with np.load(cache_file) as stored:
+            if np.array_equal(stored["_key"], key):
+                return {name: stored[name] for name in stored.files if name != "_key"}
+    arrays = parse(filename)
+    try:
+        with open(cache_file, "wb") as file: #np.savez would add a .npz suffix to a str name
+            np.savez(file, _key=key, **arrays)
+    except OSError: #e.g. a read-only folder : the file is used without cache
+        try:
+            os.remove(cache_file)
+        except OSError:
+            pass
+    return arrays
+
+
+def _parse_network(filename):
+    values = read_ints(filename)
+    if len(values) < 2:
+        raise Exception("Format incorrect")
+    n, m = values[:2].tolist()
+    edges = values[2:]
+    if len(edges) == 4 * m:
+        edges = edges.reshape(m, 4)
+    elif len(edges) == 3 * m:
+        edges = np.column_stack([edges.reshape(m, 3), np.ones(m, dtype=np.int64)]) #dist=1 by default
+    else: #lines with 3 and 4 values are mixed : one line at a time
+        with open(filename, "r") as file:
+            file.readline()
+            rows = [list(map(int, file.readline().split())) for _ in range(m)]
+        if any(len(row) not in (3, 4) for row in rows):
+            raise Exception("Format incorrect")
+        edges = np.array([row + [1] * (4 - len(row)) for row in rows], dtype=np.int64).reshape(m, 4)
+    return {"nb_nodes": np.array(n), "edges": edges}
+
+
+def _parse_table(width):
+    def parse(filename):
+        values = read_ints(filename)
+        if len(values) == 0 or len(values) < 1 + width * values[0]:
+            raise Exception("Format incorrect")
+        n = values[0].item()
+        return {"rows": values[1:1 + width * n].reshape(n, width)}
+    return parse
+
+
+def read_network(filename, cache=False):
+    """
+    Reads a network.x.in file (format described in graph_from_file).
+
+    Parameters:
+    -----------
+    filename: str
+        The name of the file
+    cache: bool, optional
+        Use (and write) the sidecar cache filename + ".npz". Default is False.
+
+    Outputs:
+    -----------
+    nb_nodes: int
+        The number of nodes n (the nodes are 1..n)
+    edges: np.ndarray
+        An array of shape (m, 4) : node1 node2 power_min dist (dist is 1 when missing)
+    """
+    arrays = _cached(filename, _parse_network, cache)
+    return arrays["nb_nodes"].item(), arrays["edges"]
+
+
+def read_routes(filename, cache=False):
+    """
+    Reads a routes.x.in file.
+
+    Outputs:
+    -----------
+    routes: np.ndarray
+        An array of shape (T, 3) : city1 city2 utility
+    """
+    return _cached(filename, _parse_table(3), cache)["rows"]
+
+
+def read_trucks(filename, cache=False):
+    """
+    Reads a trucks.x.in file.
+
+    Outputs:
+    -----------
+    trucks: np.ndarray
+        An array of shape (K, 2) : power cost
+    """
+    return _cached(filename, _parse_table(2), cache)["rows"]
+
+
+def graph_from_file(filename, cache=False):
+    """
+    Reads a text file and returns the graph as an object of the Graph class.
+    The whole file is parsed at once by loader.read_network and the adjacency lists are
+    filled in bulk (see Graph._add_edge_array).
+
+    The file should have the following format: 
+        The first line of the file is 'n m'
+        The next m lines have 'node1 node2 power_min dist' or 'node1 node2 power_min' (if dist is missing, it will be set to 1 by default)
+        The nodes (node1, node2) should be named 1..n
+        All values are integers.
+
+    Parameters:
+    -----------
+    filename: str
+        The name of the file
+    cache: bool, optional
+        Use the binary cache filename + ".npz" (see loader). Default is False.
+
+    Outputs:
+    -----------
+    g: Graph
+        An object of the class Graph with the graph from file_name.
+    """
+    with stage("load network"):
+        n, edges = read_network(filename, cache)
+        collecting = gc.isenabled()
+        gc.disable() #millions of new lists and tuples, none of them garbage : no collection meanwhile
+        try:
+            g = Graph(range(1, n+1))
+            g._add_edge_array(edges) #the adjacency lists of add_edge, built in bulk
+        finally:
+            if collecting:
+                gc.enable()
+    return g
+
+
+def csr_graph_from_file(filename, cache=False):
+    """
+    Reads a text file (same format as graph_from_file) and returns the graph as a CSRGraph,
+    without building any Python adjacency list.
+
+    Parameters:
+    -----------
+    filename: str
+        The name of the file
+    cache: bool, optional
+        Use the binary cache filename + ".npz" (see loader). Default is False.
+
+    Outputs:
+    -----------
+    g: CSRGraph
+        An object of the class CSRGraph with the graph from file_name.
+    """
+    with stage("load network"):
+        n, edges = read_network(filename, cache)
+    return CSRGraph(n, edges[:, 0], edges[:, 1], edges[:, 2], edges[:, 3])
+
+
+def route_from_file(filename, cache=False) -> List[List[int]]:
+    """
+    This function transform a text file in a list of road
+
+    Parameters:
+    -----------
+    filename : txt file
+        A text file with a list of road
+    cache : bool, optional
+        Use the binary cache filename + ".npz" (see loader). Default is False.
+
+    Outputs:
+    -----------
+    route : List[List[int]]
+        A list of roads : city1 city2 utility
+    """
+    return read_routes(filename, cache).tolist()
+
+
+def truck_from_file(filename, cache=False) -> List[List[int]]:
+    """
+    This function transform a text file in a list of truck
+
+    Parameters:
+    -----------
+    filename : txt file
+        A text file with a list of trucks
+    cache : bool, optional
+        Use the binary cache filename + ".npz" (see loader). Default is False.
+
+    Outputs:
+    -----------
+    route : List[List[int]]
+        A list of trucks : power cost
+    """
+    return read_trucks(filename, cache).tolist()
+
+
+def iter_routes(filename, chunk_size=100000):
+    """
+    Reads a routes.x.in file chunk by chunk : only one chunk is in memory at a time.
+
+    Parameters:
+    -----------
+    filename: str
+        The name of the file
+    chunk_size: int, optional
+        The number of routes per chunk. Default is 100000.
+
+    Outputs:
+    -----------
+    chunks: generator of np.ndarray
+        Arrays of shape (<= chunk_size, 3) : city1 city2 utility, in the order of the file
+    """
+    with open(filename, "rb") as file:
+        header = file.readline().split()
+        if not header:
+            raise Exception("Format incorrect")
+        remaining = int(header[0])
+        while remaining > 0:
+            lines = list(itertools.islice(file, min(chunk_size, remaining)))
+            values = _parse_ints(b"".join(lines))
+            if not lines or len(values) != 3 * len(lines):
+                raise Exception("Format incorrect")
+            remaining -= len(lines)
+            yield values.reshape(len(lines), 3)
+
+
+class ResultWriter:
+    """
+    Writes arrays of results in a .out file (one value per line). The formatting and the writing
+    are done by a background thread, so that the computation of the next chunk goes on meanwhile ;
+    at most max_pending arrays wait in memory (write blocks when the queue is full).
+    To be used as a context manager :
+
+        with ResultWriter("routes.2.out") as writer:
+            for chunk in iter_routes("input/routes.2.in"):
+                writer.write(tree.query_many(chunk))
+    """
+
+    def __init__(self, filename, max_pending=4, buffer_size=1 << 20):
+        self.count = 0
+        self._file = open(filename, "w", buffering=buffer_size)
+        self._queue = queue.Queue(max_pending)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            values = self._queue.get()
+            if values is None:
+                return
+            if self._error is None:
+                try:
+                    self._file.write("".join("{}\n".format(value) for value in values.tolist()))
+                except Exception as error: #raised again by close
+                    self._error = error
+
+    def write(self, values):
+        """Adds an array (or list) of results at the end of the file"""
+        values = np.asarray(values)
+        self.count += len(values)
+        self._queue.put(values)
+
+    def close(self):
+        """Waits for the pending results and closes the file"""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,12 +1,8 @@
-from graph import Graph, graph_from_file
-
-
-data_path = "input/"
-file_name = "network.2.in"
-
-g = graph_from_file(data_path + file_name)
-#print(g)
-#g.view()
+"""
+Answers to the questions of the project which are not in graph.py. Nothing is computed at import :
+run python delivery_network/main.py (from the root folder) to write the routes.x.out files.
+"""
+from loader import graph_from_file
 
 
 def time_array():
@@ -71,15 +67,8 @@ et sont donc nécessaire pour couvrir T. Le résultat est alors clair.
 
 """
 
-from graph import kruskal, min_power_for_path
-#We will now create files routes.xx.out
-for i in range(2, 3):
-    g = graph_from_file("input/network.{}.in".format(i))
-    g = kruskal(g)
-    route = open("input/routes.{}.in".format(i), "r")
-    fichier = open("routes.{}.out".format(i), "w")
-    n = int(list(map(int, route.readline().split()))[0]) # not opti
-    for i in range(n):
-        print(i)
-        source, destination, _ = map(int, route.readline().split())    
-        fichier.write("{}\n".format(min_power_for_path(g, source, destination)))
+if __name__ == "__main__":
+    from pipeline import solve_routes
+    #We will now create files routes.xx.out (see also : python -m delivery_network solve-routes)
+    for i in range(2, 3):
+        solve_routes("input/network.{}.in".format(i), "input/routes.{}.in".format(i), "routes.{}.out".format(i))
@@ -0,0 +1,73 @@
+"""
+Computation of the routes.x.out files on all the cores of the machine.
+
+The minimal power index (MinPowerTree) is built once in the main process. The routes file is read
+chunk by chunk (loader.iter_routes) and the chunks are answered by a pool of processes : with the
+"fork" start method the workers share the index arrays with the main process (copy-on-write),
+otherwise the index is sent once to each worker. At most 2 chunks per worker are in flight, the
+results are written in the order of the routes file by a background thread (loader.ResultWriter,
+started after the pool), so the memory does not depend on the number of routes.
+"""
+import collections
+import multiprocessing
+import os
+from graph import MinPowerTree, kruskal
+from loader import csr_graph_from_file, iter_routes, ResultWriter
+
+_tree = None #the index of a worker process
+
+
+def _init_worker(tree):
+    global _tree
+    _tree = tree
+
+
+def _solve_chunk(chunk):
+    return _tree.query_many(chunk)
+
+
+def solve_routes(network_file, routes_file, output_file, workers=None, chunk_size=10000, cache=False):
+    """
+    Writes in output_file the minimal power of each route of routes_file (one per line).
+
+    Parameters:
+    -----------
+    network_file : str
+        A network.x.in file
+    routes_file : str
+        A routes.x.in file on the same network
+    output_file : str
+        The routes.x.out file to write
+    workers : int, optional
+        The number of processes. Default is the number of cores.
+    chunk_size : int, optional
+        The number of routes read and sent to a worker at once. Default is 10000.
+    cache : bool, optional
+        Use the binary cache of the network file (see loader). Default is False.
+
+    Outputs:
+    -----------
+    nb_routes : int
+        The number of routes written
+    """
+    tree = MinPowerTree(kruskal(csr_graph_from_file(network_file, cache)))
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1:
+        with ResultWriter(output_file) as writer:
+            for chunk in iter_routes(routes_file, chunk_size):
+                writer.write(tree.query_many(chunk))
+        return writer.count
+
+    #the pool is created before the thread of the writer : forking a process that runs threads can deadlock
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    with multiprocessing.get_context(method).Pool(workers, _init_worker, (tree,)) as pool, \
+         ResultWriter(output_file) as writer:
+        pending = collections.deque() #the chunks in flight, in the order of the file
+        for chunk in iter_routes(routes_file, chunk_size):
+            pending.append(pool.apply_async(_solve_chunk, (chunk[:, :2],)))
+            if len(pending) >= 2 * workers:
+                writer.write(pending.popleft().get())
+        while pending:
+            writer.write(pending.popleft().get())
+    return writer.count
@@ -0,0 +1,535 @@
+"""
+Assignment of the trucks to the routes : the cheapest truck for each route (TruckCatalogue), a
+greedy assignment (greedy_knapsack) and two solvers of the knapsack problem on the budget
+(knapsack, a branch and bound, and knapsack_dp, an approximation scheme on scaled profits).
+"""
+import bisect
+import heapq
+import itertools
+import time
+from instrumentation import count, stage
+from lazy import lazy_import
+from graph import Graph, kruskal, min_power_for_path
+from loader import route_from_file, truck_from_file
+
+np = lazy_import("numpy")
+
+
+class TruckCatalogue:
+    """
+    The trucks of a trucks.x.in file, reduced to the ones worth buying : a truck is dominated
+    if another truck has at least its power for at most its cost. The remaining trucks (the Pareto
+    frontier) sorted by increasing power have increasing costs, so the cheapest truck able to
+    travel a route is the first one with enough power, found by bisection.
+
+    Attributes:
+    -----------
+    trucks: list
+        The frontier : a list of trucks [power, cost] sorted by increasing power (and cost)
+    powers, costs: np.ndarray
+        The powers and the costs of the trucks of the frontier
+    """
+
+    def __init__(self, trucks):
+        """
+        Builds the frontier in O(K log K).
+
+        Parameters:
+        -----------
+        trucks : list
+            A list of trucks : power cost (e.g. the output of truck_from_file)
+        """
+        frontier = []
+        for power, cost in sorted(trucks, key=lambda x: (-x[0], x[1])):
+            if not frontier or cost < frontier[-1][1]:
+                frontier.append([power, cost])
+        self.trucks = frontier[::-1]
+        self.powers = np.array([truck[0] for truck in self.trucks])
+        self.costs = np.array([truck[1] for truck in self.trucks])
+
+    def cheapest_truck_for(self, power):
+        """
+        Returns the cheapest truck [power, cost] with a power >= power, or None if no truck
+        is powerful enough. The complexity is O(log K).
+        """
+        i = bisect.bisect_left(self.powers, power)
+        return self.trucks[i] if i < len(self.trucks) else None
+
+    def cheapest_trucks_for(self, powers):
+        """
+        Vectorized version of cheapest_truck_for.
+
+        Parameters:
+        -----------
+        powers : array-like
+            The minimal powers of the routes
+
+        Outputs:
+        -----------
+        indices : np.ndarray
+            indices[i] is the index in self.trucks of the cheapest truck for powers[i],
+            -1 if no truck is powerful enough
+        """
+        indices = np.searchsorted(self.powers, powers, side="left")
+        return np.where(indices < len(self.trucks), indices, -1)
+
+
+def assign_trucks_to_routes(graph, route_file, trucks_file, budget=25*(10**9), method="greedy", epsilon=0.05):
+    """
+    This function assign a truck to a road in the optimal (heuristical) solution
+
+    Parameters:
+    -----------
+    graph : a Graph
+        A graph
+    
+    route_file : txt file
+        A text file with a list of road
+
+    trucks_file : txt file
+        A text file with a list of trucks
+
+    budget : numeric, optional
+        The total budget for the trucks. Default is 25e9.
+
+    method : str, optional
+        "greedy" (greedy_knapsack, each truck of the file is used at most once) or "dp"
+        (knapsack_dp, each route gets the cheapest model able to travel it). Default is "greedy".
+
+    epsilon : float, optional
+        The precision of knapsack_dp. Default is 0.05.
+
+    Outputs:
+    -----------
+    truck_assignments : List
+        A list of tuples (truck (= power and cost), road)
+    total_profit : Float
+        A float which is the total of the profit
+    """
+    if method not in ("greedy", "dp"):
+        raise ValueError("Unknown method : {}".format(method))
+
+    with stage("load"):
+        routes = route_from_file(route_file)
+        trucks = truck_from_file(trucks_file)
+    mst = kruskal(graph)
+
+    with stage("min_power"):
+        min_powers = []
+        for src, dest, profit in routes:
+            min_power = min_power_for_path(mst, src, dest)
+            min_powers.append((src, dest, profit, min_power))
+
+    if method == "dp":
+        with stage("trucks"):
+            catalogue = TruckCatalogue(trucks)
+            models = catalogue.cheapest_trucks_for([x[3] for x in min_powers]).tolist()
+            candidates = [(catalogue.trucks[truck], road) for truck, road in zip(models, min_powers) if truck != -1]
+        total_profit, chosen, _ = knapsack_dp(budget, [[truck[1], road[2]] for truck, road in candidates], epsilon)
+        truck_assignments = [(candidates[i][0], candidates[i][1][:2]) for i in chosen]
+        return truck_assignments, total_profit
+
+    truck_assignments, total_profit = greedy_knapsack(trucks, min_powers, budget)
+
+    return truck_assignments, total_profit
+
+class AvailableTrucks:
+    """
+    The trucks not assigned yet, sorted by power, in a segment tree that stores the cheapest truck
+    of each range : the cheapest truck with enough power for a route is found and removed in O(log K).
+
+    Attributes:
+    -----------
+    trucks: list
+        The trucks [power, cost] sorted by increasing power
+    powers: list
+        The powers of the trucks, in the same order
+    tree: list
+        tree[size + i] is (cost, i) for the truck i if it is available, (inf, -1) otherwise ;
+        tree[x] is the minimum of tree[2x] and tree[2x+1]
+    """
+
+    def __init__(self, trucks):
+        self.trucks = sorted(trucks, key=lambda x: x[0])
+        self.powers = [truck[0] for truck in self.trucks]
+        self.size = 1
+        while self.size < len(self.trucks):
+            self.size *= 2
+        self.tree = [(float("inf"), -1)] * (2 * self.size)
+        for i, truck in enumerate(self.trucks):
+            self.tree[self.size + i] = (truck[1], i)
+        for x in range(self.size - 1, 0, -1):
+            self.tree[x] = min(self.tree[2*x], self.tree[2*x+1])
+
+    def take_cheapest(self, power, budget=float("inf")):
+        """
+        Removes and returns the cheapest available truck with a power >= power, or returns None
+        (and removes nothing) if there is no such truck or if it costs more than budget.
+        """
+        best = (float("inf"), -1)
+        low, high = bisect.bisect_left(self.powers, power) + self.size, 2 * self.size
+        while low < high: #minimum of the leaves low..high-1
+            if low & 1:
+                best = min(best, self.tree[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                best = min(best, self.tree[high])
+            low, high = low // 2, high // 2
+        cost, i = best
+        if i == -1 or cost > budget:
+            return None
+        x = self.size + i
+        self.tree[x] = (float("inf"), -1)
+        while x > 1:
+            x //= 2
+            self.tree[x] = min(self.tree[2*x], self.tree[2*x+1])
+        return self.trucks[i]
+
+
+def greedy_knapsack(trucks, min_powers, budget=25*(10**9)):
+    """
+    This is the implementation of a greedy method in order to solve the knapsack problem
+    (adapted to our subject)
+
+    The routes are taken by decreasing profit / minimal power (a route with power 0 first) and
+    each one gets the cheapest available truck powerful enough, if it fits in the budget.
+    The complexity is O(T log T + K log K + T log K).
+
+    Parameters:
+    -----------    
+    trucks : list
+        A list of trucks : power cost
+
+    min_power : List[tuples]
+        A list of tuples with 
+        (city1, city2, profit, minimal power to travel the road)
+
+    budget : numeric, optional
+        The total budget for the trucks. Default is 25e9.
+
+    Outputs:
+    -----------
+    truck_assignments : List
+        A list of tuples (truck (= power and cost), road)
+    total_profit : Float
+        A float which is the total of profit
+    """
+    
+    sorted_min_powers = sorted(min_powers, key=lambda x: x[2] / x[3] if x[3] > 0 else float("inf"), reverse=True)
+    available = AvailableTrucks(trucks)
+
+    truck_assignments = []
+    total_profit = 0
+
+    for src, dest, profit, min_power in sorted_min_powers:
+        truck = available.take_cheapest(min_power, budget)
+        if truck is not None:
+            budget -= truck[1]
+            truck_assignments.append((truck, (src, dest)))
+            total_profit += profit
+
+    return truck_assignments, total_profit
+
+
+#We will now build an exact method in order to find the exact optimum
+# The name of the method is Branch&Bounds
+
+def bound(level, weight, profit, budget, prefix_weights, prefix_profits):
+    """
+    This function compute for each node a bound for the further branch.
+    This allows us to dramatically reduce the compute time
+
+    The bound is the profit of the fractional knapsack on the items level, level+1, ...
+    (sorted by decreasing profit/cost) : thanks to the prefix sums, the last item that fits
+    entirely is found with a bisection, hence the complexity is O(log n).
+
+    Parameters:
+    -----------
+    level : int
+        index of the next item to decide
+    
+    weight, profit : numeric
+        total cost and profit of the items already taken
+
+    budget : numeric
+        maximum weight
+
+    prefix_weights, prefix_profits : list
+        prefix_weights[i] is the total cost of the i first items (sorted), same for the profits
+
+    Outputs:
+    -----------
+    profit_bound: Float
+        the highest profit we can get
+    """
+    if weight > budget:
+        return 0
+
+    # last j such that the items level..j-1 fit entirely in the remaining budget
+    j = bisect.bisect_right(prefix_weights, budget - weight + prefix_weights[level]) - 1
+    profit_bound = profit + prefix_profits[j] - prefix_profits[level]
+
+    # if not all items are added, add the fraction of the next item that fits
+    if j < len(prefix_weights) - 1:
+        remaining_weight = budget - weight - (prefix_weights[j] - prefix_weights[level])
+        profit_bound += remaining_weight * (prefix_profits[j+1] - prefix_profits[j]) / (prefix_weights[j+1] - prefix_weights[j])
+
+    return profit_bound
+
+def knapsack(budget, items, max_nodes=None, max_time=None):
+    """
+    This is an implementation of the branch and bounds algorithm in order to solve the 
+    knapsack problem (adapted for our problem)
+
+    The search is best-first : the nodes wait in a heap and the node with the highest bound
+    is expanded first, so the search stops as soon as no bound is above the best profit found.
+    The first solution is the greedy one (items taken by decreasing profit/cost while they fit).
+    If the search is stopped by max_nodes or max_time, the best solution found so far is returned
+    with the optimality gap (highest bound left - best profit).
+
+    Parameters:
+    -----------
+    budget : float
+        the total budget
+    
+    items : list
+        A list of items that we can put in the knapsack : 
+        for each road we took the less costly truck that can travel the road
+        An item is each time the cost and the utility
+
+    max_nodes : int, optional
+        maximal number of nodes expanded. Default is no limit.
+
+    max_time : float, optional
+        maximal time of the search, in seconds. Default is no limit.
+
+    Outputs:
+    -----------
+    max_profit: Float
+        the highest profit we can get
+    chosen: list
+        the indices (in items) of the items of the best solution
+    gap: Float
+        an upper bound of (optimal profit - max_profit), 0 if the solution is optimal
+    """
+    n = len(items)
+    order = sorted(range(n), key=lambda i: items[i][1] / items[i][0] if items[i][0] > 0 else float("inf"), reverse=True)
+    weights = [items[i][0] for i in order]
+    profits = [items[i][1] for i in order]
+    prefix_weights = list(itertools.accumulate(weights, initial=0))
+    prefix_profits = list(itertools.accumulate(profits, initial=0))
+
+    # greedy solution : a first lower bound
+    max_profit, best_taken, weight = 0, None, 0
+    for i in range(n):
+        if weight + weights[i] <= budget:
+            weight += weights[i]
+            max_profit += profits[i]
+            best_taken = (i, best_taken)
+
+    # a node is (-bound, tie, level, weight, profit, taken) where taken is a linked list
+    # (last item taken, taken before) shared between the nodes of a branch
+    tie = itertools.count()
+    heap = [(-bound(0, 0, 0, budget, prefix_weights, prefix_profits), next(tie), 0, 0, 0, None)]
+    expanded = pruned = 0
+    start = time.perf_counter()
+    while heap and -heap[0][0] > max_profit:
+        if (max_nodes is not None and expanded >= max_nodes) or (max_time is not None and time.perf_counter() - start >= max_time):
+            break
+        _, _, level, weight, profit, taken = heapq.heappop(heap)
+        expanded += 1
+        if level == n:
+            continue
+
+        # branch 1 : the item is taken
+        if weight + weights[level] <= budget:
+            taken_with = (level, taken)
+            if profit + profits[level] > max_profit:
+                max_profit, best_taken = profit + profits[level], taken_with
+            node_bound = bound(level + 1, weight + weights[level], profit + profits[level], budget, prefix_weights, prefix_profits)
+            if node_bound > max_profit:
+                heapq.heappush(heap, (-node_bound, next(tie), level + 1, weight + weights[level], profit + profits[level], taken_with))
+            else:
+                pruned += 1
+
+        # branch 2 : the item is not taken
+        node_bound = bound(level + 1, weight, profit, budget, prefix_weights, prefix_profits)
+        if node_bound > max_profit:
+            heapq.heappush(heap, (-node_bound, next(tie), level + 1, weight, profit, taken))
+        else:
+            pruned += 1
+
+    count("knapsack.nodes_expanded", expanded)
+    count("knapsack.nodes_pruned", pruned)
+    count("knapsack.nodes_left", len(heap))
+    gap = max(0, -heap[0][0] - max_profit) if heap else 0
+    chosen = []
+    while best_taken is not None:
+        chosen.append(order[best_taken[0]])
+        best_taken = best_taken[1]
+    return max_profit, sorted(chosen), gap
+
+
+def _min_costs(scaled, costs, size, profits=None):
+    """
+    Dynamic programming on the scaled profits : cost[q] is the minimal cost of a set of items of
+    scaled profit exactly q (inf if there is none), for q in 0..size. One numpy row operation per
+    item. If profits is given, also returns value[q], the real profit of the set of cost cost[q].
+    """
+    cost = np.full(size + 1, np.inf)
+    cost[0] = 0
+    value = None if profits is None else np.zeros(size + 1)
+    for i, (q, c) in enumerate(zip(scaled, costs)):
+        if q > size:
+            continue
+        candidate = cost[:size + 1 - q] + c
+        better = candidate < cost[q:]
+        if value is not None:
+            value[q:][better] = value[:size + 1 - q][better] + profits[i]
+        cost[q:][better] = candidate[better]
+    return cost, value
+
+
+def _select(indices, scaled, costs, target):
+    """
+    Rebuilds a set of items among indices of scaled profit exactly target and of minimal cost,
+    without storing the decisions (divide and conquer, as Hirschberg) : the two halves of the
+    items are solved on 1-D tables, the best split target = a + b is found and each half is
+    solved again for its part. Only the branches with a target > 0 are explored.
+    """
+    if target == 0:
+        return []
+    if len(indices) == 1:
+        return list(indices)
+    middle = len(indices) // 2
+    first, second = indices[:middle], indices[middle:]
+    cost_first = _min_costs(scaled[first], costs[first], target)[0]
+    cost_second = _min_costs(scaled[second], costs[second], target)[0]
+    a = int(np.argmin(cost_first + cost_second[::-1]))
+    return _select(first, scaled, costs, a) + _select(second, scaled, costs, target - a)
+
+
+def knapsack_dp(budget, items, epsilon=0.05):
+    """
+    This is an approximation scheme (FPTAS) for the knapsack problem, for large sets of routes :
+    the profit of the solution is at least (1 - epsilon) times the optimal profit, and the solution
+    is always feasible.
+
+    A lower bound L of the optimum is given by the greedy solution (items by decreasing ratio).
+    With e = epsilon / 3, the items of profit > e L are "large" : at most 2 / e of them fit
+    together. Their profits are scaled down to integers q = floor(profit / (e^2 L)), and a dynamic
+    programming gives the minimal cost of each scaled profit, in a 1-D table of O(1 / e^2) cells.
+    For each scaled value q, only the floor(size / q) cheapest large items are kept, hence
+    O(log(1 / e) / e^2) items at most, whatever the number of routes. Each cell of the table is
+    completed with the "small" items by decreasing ratio (prefix sums, O(log n) per cell) and the
+    best cell is kept. The rounding loses at most 2 e L and the small items at most e L.
+    The selection is rebuilt by divide and conquer (see _select), so the memory stays O(n + 1 / e^2).
+    The complexity is O(n log n) plus the dynamic programming, which does not depend on n.
+
+    Parameters:
+    -----------
+    budget : float
+        the total budget
+
+    items : list
+        A list of items [cost, utility], as for knapsack
+
+    epsilon : float, optional
+        the precision, with 0 < epsilon < 1. Default is 0.05.
+
+    Outputs:
+    -----------
+    max_profit: Float
+        the profit of the solution
+    chosen: list
+        the indices (in items) of the items of the solution
+    gap: Float
+        an upper bound of (optimal profit - max_profit), as for knapsack : the fractional bound
+        (greedy prefix plus a fraction of the next item) minus max_profit
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError("epsilon must be between 0 and 1 (excluded), not {}".format(epsilon))
+    costs = np.array([item[0] for item in items], dtype=float)
+    profits = np.array([item[1] for item in items])
+    useful = np.flatnonzero((profits > 0) & (costs <= budget))
+    if costs[useful].sum() <= budget: #everything fits
+        return profits[useful].sum().item(), useful.tolist(), 0
+
+    #greedy lower bound, and the fractional upper bound <= prefix + next item <= 2 * lower
+    ratios = profits[useful] / np.maximum(costs[useful], 1e-300)
+    by_ratio = useful[np.argsort(-ratios, kind="stable")]
+    nb_fit = int(np.searchsorted(np.cumsum(costs[by_ratio]), budget, side="right"))
+    prefix_profit = profits[by_ratio[:nb_fit]].sum()
+    lower = max(prefix_profit, profits[useful].max())
+    upper = prefix_profit + profits[by_ratio[nb_fit]]
+    left = budget - costs[by_ratio[:nb_fit]].sum()
+    fractional = prefix_profit + profits[by_ratio[nb_fit]] * left / costs[by_ratio[nb_fit]] #the bound of the gap
+
+    e = epsilon / 3
+    scale = e * e * lower
+    size = int(upper // scale)
+    is_large = profits[by_ratio] > e * lower
+    large, small = by_ratio[is_large], by_ratio[~is_large]
+
+    #the cheapest floor(size / q) large items of each scaled profit q
+    scaled = (profits // scale).astype(np.int64)
+    large = large[np.lexsort((costs[large], scaled[large]))]
+    if len(large):
+        group_start = np.flatnonzero(np.concatenate([[True], scaled[large][1:] != scaled[large][:-1]]))
+        group_size = np.diff(np.concatenate([group_start, [len(large)]]))
+        rank = np.arange(len(large)) - np.repeat(group_start, group_size)
+        large = large[rank < size // scaled[large]]
+    count("knapsack_dp.large_items", len(large))
+    count("knapsack_dp.cells", size + 1)
+
+    large_cost, large_value = _min_costs(scaled[large].tolist(), costs[large].tolist(), size, profits[large].tolist())
+    small_costs = np.concatenate([[0], np.cumsum(costs[small])])
+    small_profits = np.concatenate([[0], np.cumsum(profits[small])])
+    feasible = np.flatnonzero(large_cost <= budget)
+    nb_small = np.searchsorted(small_costs, budget - large_cost[feasible], side="right") - 1
+    best = feasible[np.argmax(large_value[feasible] + small_profits[nb_small])]
+
+    chosen = large[_select(np.arange(len(large)), scaled[large], costs[large], best)].tolist()
+    left = budget - costs[chosen].sum()
+    for item in small.tolist(): #greedy completion with the small items
+        if costs[item] <= left:
+            chosen.append(item)
+            left -= costs[item]
+    max_profit = profits[chosen].sum().item()
+    return max_profit, sorted(chosen), max(fractional.item() - max_profit, 0)
+
+
+def wrapper(graph: Graph, route_file, trucks_file, method="branch_and_bound", epsilon=0.05, budget=25*(10**9),
+            max_nodes=None, max_time=None):
+    """
+    This is a wrapp function, no need to explain
+    (method is "branch_and_bound" for knapsack or "dp" for knapsack_dp with the given epsilon,
+    budget is the total budget for the trucks, max_nodes and max_time are the limits of knapsack)
+    The result is (profit, chosen, gap) for both methods, the chosen indices being the lines of route_file.
+    """
+    if method not in ("branch_and_bound", "dp"):
+        raise ValueError("Unknown method : {}".format(method))
+
+    g = kruskal(graph)
+
+    with stage("load"):
+        routes = route_from_file(route_file)
+        trucks = truck_from_file(trucks_file)
+
+    with stage("min_power"):
+        power_mins = [min_power_for_path(g, road[0], road[1]) for road in routes]
+    with stage("trucks"):
+        catalogue = TruckCatalogue(trucks)
+        summary_of_pb = []
+        route_indices = [] #the index in routes of each item of summary_of_pb
+        for i, (road, truck) in enumerate(zip(routes, catalogue.cheapest_trucks_for(power_mins).tolist())):
+            if truck != -1: #a route that no truck can travel is left out
+                summary_of_pb.append([catalogue.trucks[truck][1], road[2]])
+                route_indices.append(i)
+
+    if method == "dp":
+        result = knapsack_dp(budget, summary_of_pb, epsilon)
+    else:
+        result = knapsack(budget, summary_of_pb, max_nodes, max_time)
+    return result[0], [route_indices[i] for i in result[1]], result[2]
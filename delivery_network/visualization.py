@@ -0,0 +1,202 @@
+"""
+Visualization of the graphs with graphviz (imported only when a graph is rendered).
+
+The DOT file is written line by line by write_dot (no graphviz object is built in memory) and each
+edge is written once in O(1), so writing the DOT of a graph is O(V+E). For big networks, only a
+part of the graph is drawn :
+    - view_route : the minimal power path of a traject and the k-hop neighborhood of its nodes
+    - view_mst : the minimum spanning tree restricted to some nodes (and the tree paths between them)
+"""
+import os
+from collections import deque
+
+OUTPUT_DIRECTORY = "graph_viz_output"
+
+
+def _quote(node):
+    return '"{}"'.format(str(node).replace('"', '\\"'))
+
+
+def write_dot(g, filename, nodes=None, path=None, name="Graph"):
+    """
+    Writes the graph g in the DOT format, in the same layout as the former graphviz version of view :
+    an edge is labelled with its minimal power and its distance, the nodes and the edges of path are red.
+
+    Parameters:
+    -----------
+    g : Graph
+        The graph to write
+    filename : str
+        The DOT file to write
+    nodes : iterable, optional
+        Only the subgraph induced by these nodes is written. Default is all the nodes.
+    path : list, optional
+        A path of g, drawn in red. Default is None.
+    name : str, optional
+        The name of the graph. Default is "Graph".
+
+    Outputs:
+    -----------
+    filename : str
+        The DOT file written
+    """
+    nodes = list(g.nodes) if nodes is None else [node for node in dict.fromkeys(nodes) if node in g.graph]
+    rank = dict((node, i) for i, node in enumerate(nodes)) #each edge is written from its end of smaller rank
+    path = path or []
+    on_path = set(path)
+    path_edges = set()
+    for a, b in zip(path, path[1:]):
+        path_edges.add((a, b))
+        path_edges.add((b, a))
+
+    os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+    with open(filename, "w") as file:
+        file.write("// Graph visualisation\ngraph {} {{\n\tgraph [concentrate=True]\n".format(_quote(name)))
+        for node in nodes:
+            file.write("\t{}{}\n".format(_quote(node), " [color=red fontcolor=red]" if node in on_path else ""))
+        for node in nodes:
+            loop = False #a loop appears twice in the adjacency list of its node
+            for neighbor, power, dist in g.graph[node]:
+                if neighbor == node:
+                    loop = not loop
+                    if not loop:
+                        continue
+                elif rank.get(neighbor, -1) < rank[node]:
+                    continue
+                color = " color=red" if (node, neighbor) in path_edges else ""
+                file.write('\t{} -- {} [label="weight = {}\\n length = {}"{} weight={}]\n'.format(
+                    _quote(node), _quote(neighbor), power, dist, color, power))
+        file.write("}\n")
+    return filename
+
+
+def neighborhood(g, sources, k):
+    """
+    Returns the set of the nodes at most k edges away from one of the nodes of sources (BFS).
+    """
+    seen = set(sources)
+    frontier = deque((node, 0) for node in seen)
+    while frontier:
+        node, distance = frontier.popleft()
+        if distance == k:
+            continue
+        for neighbor, _, _ in g.graph[node]:
+            if neighbor not in seen:
+                seen.add(neighbor)
+                frontier.append((neighbor, distance + 1))
+    return seen
+
+
+def render(filename, view=True):
+    """
+    Renders a DOT file in pdf with graphviz (and opens it if view is True).
+    Returns the name of the pdf file.
+    """
+    import graphviz
+    output = graphviz.render("dot", "pdf", filename)
+    if view:
+        graphviz.view(output)
+    return output
+
+
+def view_route(g, src, dest, k=1, filename=None, show=True):
+    """
+    Draws the minimal power path between src and dest (in red) and the nodes at most k edges away
+    from the path, instead of the whole graph.
+
+    Parameters:
+    -----------
+    g : Graph
+        The graph
+    src, dest : NodeType
+        The ends of the traject
+    k : int, optional
+        The size of the neighborhood drawn around the path. Default is 1.
+    filename : str, optional
+        The DOT file. Default is graph_viz_output/route_src_dest.gv.
+    show : bool, optional
+        Render the DOT file with graphviz and open it. Default is True.
+
+    Outputs:
+    -----------
+    filename : str
+        The DOT file written
+    """
+    path, _ = g.min_power(src, dest)
+    filename = filename or os.path.join(OUTPUT_DIRECTORY, "route_{}_{}.gv".format(src, dest))
+    write_dot(g, filename, path + list(neighborhood(g, path, k)), path)
+    if show:
+        render(filename)
+    return filename
+
+
+def view_mst(g, nodes, k=0, connect=True, filename=None, show=True):
+    """
+    Draws the minimum spanning tree of g restricted to the given nodes.
+
+    Parameters:
+    -----------
+    g : Graph
+        The graph (its maintained tree g.mst is used if there is one, see Graph.maintain_mst)
+    nodes : list
+        The nodes to draw
+    k : int, optional
+        Also draw the nodes at most k edges away in the tree. Default is 0.
+    connect : bool, optional
+        Also draw the nodes of the tree paths between the given nodes. Default is True.
+    filename : str, optional
+        The DOT file. Default is graph_viz_output/mst.gv.
+    show : bool, optional
+        Render the DOT file with graphviz and open it. Default is True.
+
+    Outputs:
+    -----------
+    filename : str
+        The DOT file written
+    """
+    from graph import kruskal, min_power_for_path
+    mst = g.mst if g.mst is not None else kruskal(g)
+    selected = list(nodes)
+    if connect:
+        for node in selected[1:]:
+            try:
+                selected += min_power_for_path(mst, selected[0], node, return_path=True)[1]
+            except ValueError: #not in the same tree
+                pass
+    filename = filename or os.path.join(OUTPUT_DIRECTORY, "mst.gv")
+    write_dot(mst, filename, selected + list(neighborhood(mst, selected, k)))
+    if show:
+        render(filename)
+    return filename
+
+
+def view(g, node1 = None, node2 = None, k = None):
+    """
+    Displays the graph g (see Graph.view) ; the minimal power path between node1 and node2,
+    if they are given, is drawn in red. The graph is saved in the folder graph_viz_output.
+    If k is given, only the path and the nodes at most k edges away from it are drawn (see view_route).
+
+    Parameters:
+    -----------
+    g : Graph
+        The graph to draw
+    node1 : NodeType
+        A node of the graph
+    node2 : NodeType
+        Another node of the graph
+    k : int, optional
+        The size of the neighborhood drawn around the path. Default is None (the whole graph).
+
+    Outputs:
+    -----------
+    None
+    """
+    filename = os.path.join(OUTPUT_DIRECTORY, "Graph.gv")
+    if node1 is not None and node2 is not None:
+        if k is not None:
+            view_route(g, node1, node2, k, filename)
+            return
+        write_dot(g, filename, path=g.min_power(node1, node2)[0])
+    else:
+        write_dot(g, filename)
+    render(filename)
@@ -17,5 +17,22 @@ class Test_GraphCC(unittest.TestCase):
         cc = g.connected_components_set()
         self.assertEqual(cc, {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})})
 
+    def test_labels(self):
+        g = graph_from_file("input/network.01.in")
+        labels, sizes = g.component_labels()
+        self.assertEqual(labels.tolist(), [0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual(sizes.tolist(), [3, 4])
+        self.assertTrue(g.same_component(1, 3))
+        self.assertFalse(g.same_component(3, 4))
+        g.add_edge(3, 4, 1)
+        self.assertTrue(g.same_component(1, 7))
+
+    def test_long_chain(self):
+        g = Graph(list(range(1, 100001)))
+        for node in range(1, 100000):
+            g.add_edge(node, node + 1, 1)
+        self.assertEqual(len(g.connected_components()), 1)
+        self.assertTrue(g.same_component(1, 100000))
+
 if __name__ == '__main__':
     unittest.main()
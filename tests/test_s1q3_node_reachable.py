@@ -17,5 +17,19 @@ class Test_Reachability(unittest.TestCase):
         self.assertIn(g.get_path_with_power(1, 2, 11), [[1, 2], [1, 4, 3, 2]])
         self.assertEqual(g.get_path_with_power(1, 2, 5), [1, 4, 3, 2])
 
+    def test_reachable(self):
+        g = graph_from_file("input/network.00.in")
+        self.assertTrue(g.reachable_with_power(1, 4, 11))
+        self.assertFalse(g.reachable_with_power(1, 4, 10))
+        g = graph_from_file("input/network.01.in")
+        self.assertFalse(g.reachable_with_power(1, 4, 100))
+
+    def test_long_chain(self):
+        n = 50000
+        g = Graph(list(range(1, n+1)))
+        for i in range(1, n):
+            g.add_edge(i, i+1, 1)
+        self.assertEqual(g.get_path_with_power(1, n, 1), list(range(1, n+1)))
+
 if __name__ == '__main__':
     unittest.main()
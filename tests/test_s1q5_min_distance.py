@@ -1 +1,79 @@
-# À compléter
\ No newline at end of file
+# This will work if ran from the root folder.
+import sys
+sys.path.append("delivery_network")
+
+import random
+from graph import Graph, graph_from_file
+
+import unittest   # The test framework
+
+class Test_MinDistance(unittest.TestCase):
+    def test_network4(self):
+        g = graph_from_file("input/network.04.in")
+        self.assertEqual(g.shortest_path_with_power(1, 3, 11), ([1, 4, 3], 8))
+        self.assertEqual(g.shortest_path_with_power(1, 3, 10), ([1, 2, 3], 92))
+        self.assertEqual(g.shortest_path_with_power(1, 3, 3), None)
+        self.assertEqual(g.shortest_path_with_power(1, 5, 100), None)
+        self.assertEqual(g.shortest_path_with_power(3, 3, 0), ([3], 0))
+
+    def test_batch(self):
+        g = graph_from_file("input/network.04.in")
+        paths = g.shortest_paths_with_power(1, 11, [2, 3, 4, 5])
+        self.assertEqual(paths, {2: ([1, 4, 3, 2], 11), 3: ([1, 4, 3], 8), 4: ([1, 4], 6), 5: None})
+        self.assertEqual(g.shortest_paths_with_power(1, 10)[4], ([1, 2, 3, 4], 94))
+
+    def test_random(self):
+        rng = random.Random(0)
+        n = 200
+        g = Graph(list(range(1, n+1)))
+        for _ in range(600):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, 10), rng.randint(0, 100))
+        for src in range(1, n+1, 20):
+            power = rng.randint(3, 10)
+            paths = g.shortest_paths_with_power(src, power)
+            for dest in range(1, n+1):
+                result = g.shortest_path_with_power(src, dest, power)
+                if paths[dest] is None:
+                    self.assertEqual(result, None)
+                    continue
+                path, dist = result
+                self.assertEqual(dist, paths[dest][1])
+                self.assertEqual((path[0], path[-1]), (src, dest))
+                length = 0
+                for a, b in zip(path, path[1:]): # the path exists and has the given length
+                    length += min(d for neighbor, power_min, d in g.graph[a] if neighbor == b and power_min <= power)
+                self.assertEqual(length, dist)
+
+class Test_Pareto(unittest.TestCase):
+    def test_network4(self):
+        g = graph_from_file("input/network.04.in")
+        self.assertEqual(g.pareto_routes(1, 3), ([(4, 92, [1, 2, 3]), (11, 8, [1, 4, 3])], True))
+        self.assertEqual(g.pareto_routes(1, 3, max_points=1), ([(11, 8, [1, 4, 3])], False))
+        self.assertEqual(g.pareto_routes(1, 5), ([], True))
+        self.assertEqual(g.pareto_routes(2, 2), ([(0, 0, [2])], True))
+
+    def test_random(self):
+        rng = random.Random(1)
+        n = 60
+        g = Graph(list(range(1, n+1)))
+        for _ in range(150):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(0, 30), rng.randint(0, 100))
+        powers = sorted(set(power for node in g.graph for _, power, _ in g.graph[node]))
+        for _ in range(30):
+            src, dest = rng.randint(1, n), rng.randint(1, n)
+            if src == dest:
+                continue
+            expected = [] # one search per distinct power
+            for power in powers:
+                result = g.shortest_path_with_power(src, dest, power)
+                if result is not None and (not expected or result[1] < expected[-1][1]):
+                    expected.append((power, result[1]))
+            frontier, complete = g.pareto_routes(src, dest)
+            self.assertTrue(complete)
+            self.assertEqual([(power, dist) for power, dist, _ in frontier], expected)
+            for power, dist, path in frontier:
+                self.assertEqual(g.shortest_path_with_power(src, dest, power)[1], dist)
+                self.assertEqual((path[0], path[-1]), (src, dest))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,7 @@
 import sys 
 sys.path.append("delivery_network")
 
-from graph import graph_from_file
+from graph import Graph, graph_from_file
 import unittest   # The test framework
 
 class Test_MinimalPower(unittest.TestCase):
@@ -15,5 +15,16 @@ class Test_MinimalPower(unittest.TestCase):
         g = graph_from_file("input/network.04.in")
         self.assertEqual(g.min_power(1, 4)[1], 4)
 
+    def test_network01_disconnected(self):
+        g = graph_from_file("input/network.01.in")
+        self.assertRaises(ValueError, g.min_power, 1, 4)
+
+    def test_float_powers(self):
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 0.5)
+        g.add_edge(2, 3, 1.25)
+        g.add_edge(1, 3, 2.5)
+        self.assertEqual(g.min_power(1, 3), ([1, 2, 3], 1.25))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,49 @@
+# This will work if ran from the root folder.
+import sys
+sys.path.append("delivery_network")
+
+import os
+import shutil
+import tempfile
+from graph import graph_from_file, route_from_file, kruskal, MinPowerTree
+from cache import MinPowerCache
+import unittest   # The test framework
+
+class Test_Cache(unittest.TestCase):
+    def test_lru(self):
+        g = graph_from_file("input/network.01.in")
+        calls = []
+        cache = MinPowerCache(lambda a, b: calls.append((a, b)) or g.min_power(a, b)[1], max_size=2)
+        self.assertEqual(cache.query(3, 1), 1)
+        self.assertEqual(cache.query(1, 3), 1) # same key
+        self.assertEqual(calls, [(1, 3)])
+        self.assertRaises(ValueError, cache.query, 1, 4)
+        self.assertRaises(ValueError, cache.query, 4, 1) # the error is cached too
+        self.assertEqual(cache.query(5, 7), 1) # (1, 3) leaves the memory
+        self.assertEqual(cache.query(1, 3), 1)
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["misses"], 4)
+
+    def test_store(self):
+        folder = tempfile.mkdtemp()
+        try:
+            network, store = os.path.join(folder, "network.in"), os.path.join(folder, "min_power.sqlite")
+            shutil.copy("input/network.1.in", network)
+            routes = route_from_file("input/routes.1.in")
+            expected = MinPowerTree(kruskal(graph_from_file(network))).query_many(routes).tolist()
+            with MinPowerCache.from_file(network, store) as cache:
+                self.assertEqual(cache.query_many(routes), expected)
+            with MinPowerCache.from_file(network, store) as cache: # a new job : answered by the store
+                self.assertEqual(cache.query_many(routes), expected)
+                self.assertEqual(cache.stats()["misses"], 0)
+            with open(network, "a") as file: # the network changes : the store is not used
+                file.write("\n")
+            with MinPowerCache.from_file(network, store) as cache:
+                self.assertEqual(cache.query_many(routes[:10]), expected[:10])
+                self.assertEqual(cache.stats()["store_hits"], 0)
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file, kruskal, CSRGraph
+import unittest   # The test framework
+
+class Test_CSRGraph(unittest.TestCase):
+    def test_network00(self):
+        g = graph_from_file("input/network.00.in").to_csr()
+        self.assertEqual(g.nb_nodes, 10)
+        self.assertEqual(g.nb_edges, 9)
+        self.assertEqual(g.connected_components_set(), {frozenset({1, 2, 3, 4, 5, 6, 7, 8, 9, 10})})
+        self.assertEqual(g.get_path_with_power(1, 4, 11), [1, 2, 3, 4])
+        self.assertEqual(g.get_path_with_power(1, 4, 10), None)
+        self.assertEqual(g.min_power(1, 4), ([1, 2, 3, 4], 11))
+        self.assertEqual(g.min_power(2, 4)[1], 10)
+
+    def test_network01(self):
+        g = graph_from_file("input/network.01.in").to_csr()
+        self.assertEqual(g.connected_components_set(), {frozenset({1, 2, 3}), frozenset({4, 5, 6, 7})})
+        self.assertRaises(ValueError, g.min_power, 1, 4)
+        labels, sizes = g.component_labels()
+        self.assertEqual(labels.tolist(), [0, 0, 0, 1, 1, 1, 1]) # same as Graph.component_labels
+        self.assertEqual(sizes.tolist(), [3, 4])
+        graph_labels, graph_sizes = graph_from_file("input/network.01.in").component_labels()
+        self.assertEqual((labels.tolist(), sizes.tolist()), (graph_labels.tolist(), graph_sizes.tolist()))
+        self.assertTrue(g.same_component(5, 6))
+        self.assertFalse(g.same_component(2, 6))
+
+    def test_network02(self):
+        g = graph_from_file("input/network.02.in").to_csr()
+        self.assertIn(g.get_path_with_power(1, 2, 11), [[1, 2], [1, 4, 3, 2]])
+        self.assertEqual(g.get_path_with_power(1, 2, 5), [1, 4, 3, 2])
+
+    def test_mst05(self):
+        g = graph_from_file("input/network.05.in")
+        g_mst = kruskal(g.to_csr())
+        self.assertIsInstance(g_mst, CSRGraph)
+        self.assertEqual(g_mst.nb_edges, 3)
+        self.assertEqual(g_mst.connected_components_set(), {frozenset({1, 2, 3, 4})})
+        self.assertEqual(sorted(g_mst.power.tolist()), [2, 4, 6])
+
+if __name__ == '__main__':
+    unittest.main()
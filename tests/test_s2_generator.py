@@ -0,0 +1,47 @@
+# This will work if ran from the root folder.
+import sys
+sys.path.append("delivery_network")
+
+import shutil
+import tempfile
+from graph import csr_graph_from_file, kruskal, MinPowerTree
+from generator import generate_network, generate_files
+from loader import read_network, read_routes, read_trucks
+import unittest   # The test framework
+
+class Test_Generator(unittest.TestCase):
+    def test_topologies(self):
+        for topology in ["tree", "grid", "geometric"]:
+            for power in ["uniform", "lognormal", "distance"]:
+                edges = generate_network(500, 1500, topology, power, max_power=1000, seed=3)
+                self.assertEqual(edges.shape[1], 4)
+                self.assertTrue((edges[:, :2] >= 1).all() and (edges[:, :2] <= 500).all())
+                self.assertTrue((edges[:, 0] != edges[:, 1]).all())
+                self.assertTrue((edges[:, 2] >= 1).all() and (edges[:, 2] <= 1000).all())
+                self.assertTrue((edges[:, 3] >= 1).all())
+                pairs = set((min(a, b), max(a, b)) for a, b in edges[:, :2].tolist())
+                self.assertEqual(len(pairs), len(edges)) #no duplicates
+
+    def test_seed(self):
+        self.assertEqual(generate_network(300, 600, "geometric", seed=1).tolist(),
+                         generate_network(300, 600, "geometric", seed=1).tolist())
+        self.assertNotEqual(generate_network(300, 600, seed=1).tolist(), generate_network(300, 600, seed=2).tolist())
+
+    def test_files(self):
+        folder = tempfile.mkdtemp()
+        try:
+            network, routes, trucks = generate_files(folder, 7, 2000, 5000, nb_routes=300, nb_trucks=10,
+                                                     topology="geometric", seed=5)
+            n, edges = read_network(network)
+            self.assertEqual(n, 2000)
+            g = csr_graph_from_file(network)
+            self.assertEqual(len(g.connected_components()), 1)
+            self.assertEqual(read_routes(routes).shape, (300, 3))
+            self.assertEqual(read_trucks(trucks).shape, (10, 2))
+            self.assertEqual(read_trucks(trucks)[:, 0].max(), 10**6)
+            MinPowerTree(kruskal(g)).query_many(read_routes(routes)) #every route can be answered
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
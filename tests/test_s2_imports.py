@@ -0,0 +1,32 @@
+# This will work if ran from the root folder.
+import sys
+sys.path.append("delivery_network")
+
+import subprocess
+import unittest   # The test framework
+
+class Test_Imports(unittest.TestCase):
+    def test_no_side_effect(self):
+        # a fresh interpreter : importing the modules reads no file and does not load numpy yet
+        code = ("import sys; sys.path.append('delivery_network'); import builtins; opened = []; "
+                "open_ = builtins.open; builtins.open = lambda *a, **k: opened.append(a[0]) or open_(*a, **k); "
+                "import graph, loader, solvers, visualization, main; "
+                "print(type(sys.modules['numpy']).__name__, 'graphviz' in sys.modules, opened)")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.split(), ["_LazyModule", "False", "[]"])
+
+    def test_reexports(self):
+        import graph, loader, solvers
+        self.assertIs(graph.graph_from_file, loader.graph_from_file)
+        self.assertIs(graph.knapsack, solvers.knapsack)
+        self.assertRaises(AttributeError, getattr, graph, "not_a_function")
+
+    def test_cli_no_path(self):
+        result = subprocess.run([sys.executable, "-m", "delivery_network", "min-power", "input/network.01.in", "1", "4"],
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("no path between 1 and 4", result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
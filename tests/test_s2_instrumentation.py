@@ -0,0 +1,61 @@
+# This will work if ran from the root folder.
+import sys
+sys.path.append("delivery_network")
+
+import json
+import os
+import shutil
+import tempfile
+import instrumentation
+from graph import graph_from_file, kruskal, knapsack, wrapper
+import unittest   # The test framework
+
+class Test_Instrumentation(unittest.TestCase):
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def test_disabled(self):
+        instrumentation.reset()
+        kruskal(graph_from_file("input/network.1.in"))
+        self.assertEqual(instrumentation.report(), {"stages": {}, "counters": {}})
+
+    def test_wrapper(self):
+        g = graph_from_file("input/network.1.in")
+        instrumentation.reset()
+        instrumentation.enable(memory=True)
+        wrapper(g, "input/routes.1.in", "input/trucks.1.in")
+        report = instrumentation.report()
+        for name in ["kruskal", "load", "min_power", "trucks"]:
+            self.assertEqual(report["stages"][name]["calls"], 1)
+            self.assertIsNotNone(report["stages"][name]["peak_memory_mb"])
+        self.assertEqual(report["counters"]["kruskal.unions"], 19) # a spanning tree of the 20 nodes
+        self.assertEqual(report["counters"]["min_power_for_path.steps"] > 0, True)
+        self.assertIn("knapsack.nodes_expanded", report["counters"])
+        self.assertIn("knapsack.nodes_pruned", report["counters"])
+
+    def test_knapsack_counters(self):
+        instrumentation.enable()
+        self.assertEqual(knapsack(10, [[6, 30], [5, 20], [5, 20]])[0], 40) # the greedy solution is 30
+        counters = instrumentation.report()["counters"]
+        self.assertEqual(counters["knapsack.nodes_expanded"] > 0, True)
+        self.assertEqual(counters["knapsack.nodes_pruned"] > 0, True)
+
+    def test_export(self):
+        folder = tempfile.mkdtemp()
+        try:
+            stats, prof = os.path.join(folder, "stats.json"), os.path.join(folder, "kruskal.prof")
+            instrumentation.enable()
+            with instrumentation.profile(prof):
+                kruskal(graph_from_file("input/network.1.in"))
+            instrumentation.export_json(stats)
+            with open(stats) as file:
+                self.assertEqual(json.load(file)["stages"]["kruskal"]["calls"], 1)
+            self.assertTrue(os.path.exists(prof))
+            with open(prof + ".txt") as file:
+                self.assertIn("kruskal", file.read())
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
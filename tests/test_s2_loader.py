@@ -0,0 +1,83 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import shutil
+import tempfile
+from graph import Graph, graph_from_file, csr_graph_from_file, route_from_file, truck_from_file
+from loader import read_network, read_routes, iter_routes, ResultWriter
+import unittest   # The test framework
+
+class Test_Loader(unittest.TestCase):
+    def test_network04(self):
+        n, edges = read_network("input/network.04.in")
+        self.assertEqual(n, 10)
+        self.assertEqual(edges.shape, (4, 4))
+        g = csr_graph_from_file("input/network.04.in")
+        self.assertEqual(g.nb_edges, 4)
+        self.assertEqual(g.min_power(1, 4)[1], 4)
+
+    def test_routes_trucks(self):
+        self.assertEqual(route_from_file("input/routes.1_2.in"), [[5, 4, 5], [2, 9, 1323], [2, 7, 9742]])
+        self.assertEqual(truck_from_file("input/trucks.0_2.in"), [[2000000, 25000000000], [6000000, 25000000000]])
+
+    def test_cache(self):
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, "routes.in")
+            shutil.copy("input/routes.1_2.in", filename)
+            self.assertEqual(read_routes(filename, cache=True).tolist(), [[5, 4, 5], [2, 9, 1323], [2, 7, 9742]])
+            self.assertTrue(os.path.exists(filename + ".npz"))
+            self.assertEqual(read_routes(filename, cache=True).tolist(), [[5, 4, 5], [2, 9, 1323], [2, 7, 9742]])
+            with open(filename, "w") as file: #the cache is invalidated when the file changes
+                file.write("1\n1 2 3\n")
+            self.assertEqual(read_routes(filename, cache=True).tolist(), [[1, 2, 3]])
+        finally:
+            shutil.rmtree(folder)
+
+    def test_bulk_graph(self):
+        for filename in ["input/network.04.in", "input/network.1.in"]:
+            n, edges = read_network(filename)
+            expected = Graph(range(1, n+1))
+            for node1, node2, power_min, dist in edges.tolist():
+                expected.add_edge(node1, node2, power_min, dist)
+            g = graph_from_file(filename)
+            self.assertEqual(g.graph, expected.graph) #same lists in the same order as add_edge
+            self.assertEqual(g.nb_edges, expected.nb_edges)
+        g = Graph(range(1, 4))
+        g.add_edge(1, 2, 5)
+        g._add_edge_array([[2, 2, 3, 1], [3, 1, 4, 2]]) #a self-loop, and nodes which already have edges
+        self.assertEqual(g.graph, {1: [(2, 5, 1), (3, 4, 2)], 2: [(1, 5, 1), (2, 3, 1), (2, 3, 1)], 3: [(1, 4, 2)]})
+        self.assertEqual(g.nb_edges, 3)
+
+    def test_cache_unwritable(self):
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, "network.in")
+            shutil.copy("input/network.04.in", filename)
+            os.mkdir(filename + ".npz") #the sidecar file can't be written
+            n, edges = read_network(filename, cache=True)
+            self.assertEqual((n, edges.shape), (10, (4, 4)))
+            self.assertEqual(graph_from_file(filename, cache=True).nb_edges, 4)
+        finally:
+            shutil.rmtree(folder)
+
+    def test_streaming(self):
+        chunks = list(iter_routes("input/routes.1.in", chunk_size=50))
+        self.assertEqual([len(chunk) for chunk in chunks], [50, 50, 40])
+        self.assertEqual(sum((chunk.tolist() for chunk in chunks), []), route_from_file("input/routes.1.in"))
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, "routes.out")
+            with ResultWriter(filename, max_pending=1) as writer:
+                for chunk in chunks:
+                    writer.write(chunk[:, 2])
+            self.assertEqual(writer.count, 140)
+            with open(filename, "r") as file:
+                self.assertEqual([int(line) for line in file], [route[2] for route in route_from_file("input/routes.1.in")])
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()
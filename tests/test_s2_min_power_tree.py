@@ -0,0 +1,52 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+from graph import graph_from_file, route_from_file, kruskal, MinPowerTree, min_powers_for_routes, min_power_for_path
+import unittest   # The test framework
+
+class Test_MinPowerTree(unittest.TestCase):
+    def test_network00(self):
+        g = graph_from_file("input/network.00.in")
+        tree = MinPowerTree(kruskal(g))
+        self.assertEqual(tree.query(1, 4), 11)
+        self.assertEqual(tree.query(2, 4), 10)
+        self.assertEqual(tree.query(4, 4), 0)
+        self.assertEqual(list(tree.query_many([(1, 4), (2, 4), (4, 4)])), [11, 10, 0])
+
+    def test_network1(self):
+        g = graph_from_file("input/network.1.in")
+        tree = MinPowerTree(kruskal(g))
+        routes = [road for road in route_from_file("input/routes.1.in") if road[0] != road[1]]
+        expected = [g.min_power(src, dest)[1] for src, dest, _ in routes]
+        self.assertEqual(list(tree.query_many(routes)), expected)
+        self.assertEqual([tree.query(src, dest) for src, dest, _ in routes], expected)
+        self.assertEqual(list(min_powers_for_routes(g, routes)), expected)
+
+    def test_disconnected(self):
+        g = graph_from_file("input/network.01.in")
+        tree = MinPowerTree(kruskal(g))
+        self.assertRaises(ValueError, tree.query, 1, 4)
+        self.assertRaises(ValueError, tree.query_many, [(1, 4)])
+        self.assertRaises(ValueError, min_powers_for_routes, g, [(1, 2), (1, 4)])
+        self.assertEqual(list(min_powers_for_routes(g, [(1, 3), (4, 7), (5, 5)])), [1, 1, 0])
+
+    def test_min_power_for_path(self):
+        g = graph_from_file("input/network.1.in")
+        g_mst = kruskal(g)
+        routes = route_from_file("input/routes.1.in")
+        with open("routes.1.out", "r") as file:
+            self.assertEqual([min_power_for_path(g_mst, src, dest) for src, dest, _ in routes], [int(line) for line in file])
+
+    def test_min_power_for_path_details(self):
+        g_mst = kruskal(graph_from_file("input/network.00.in"))
+        power, path, bottleneck = min_power_for_path(g_mst, 4, 1, return_path=True)
+        self.assertEqual((power, path), (11, [4, 3, 2, 1]))
+        self.assertEqual(({bottleneck[0], bottleneck[1]}, bottleneck[2]), ({1, 2}, 11))
+        self.assertEqual(min_power_for_path(g_mst, 6, 6, return_path=True), (0, [6], None))
+        g_forest = kruskal(graph_from_file("input/network.01.in"))
+        self.assertEqual(min_power_for_path(g_forest, 7, 4), 1)
+        self.assertRaises(ValueError, min_power_for_path, g_forest, 1, 4)
+
+if __name__ == '__main__':
+    unittest.main()
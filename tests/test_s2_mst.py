@@ -2,7 +2,8 @@
 import sys 
 sys.path.append("delivery_network")
 
-from graph import graph_from_file, kruskal
+from graph import MinPowerTree, Graph, graph_from_file, kruskal
+import random
 import unittest   # The test framework
 
 class Test_MST(unittest.TestCase):
@@ -31,5 +32,107 @@ class Test_MST(unittest.TestCase):
                         }
         self.assertEqual(g_mst.graph, mst_expected)
 
+    def test_network04_distances(self):
+        g = graph_from_file("input/network.04.in")
+        g_mst = kruskal(g)
+        self.assertEqual(g_mst.nb_edges, 3)
+        self.assertEqual(g_mst.graph[1], [(2, 4, 89)]) # the distances are kept
+
+    def test_long_chain(self):
+        n = 20000 # far beyond the recursion limit
+        g = Graph(list(range(1, n+1)))
+        for i in range(1, n):
+            g.add_edge(i, i+1, n-i)
+        g.add_edge(1, n, n+1)
+        g_mst = kruskal(g)
+        self.assertEqual(g_mst.nb_edges, n-1)
+        self.assertEqual(g_mst.graph[n], [(n-1, 1, 1)])
+
+    def test_incremental(self):
+        g = graph_from_file("input/network.00.in")
+        g.maintain_mst()
+        self.assertEqual(g.query_min_power(1, 7), 14)
+        g.add_edge(6, 7, 3) # replaces the edge (5, 7, 14) of the cycle 6-1-2-5-7
+        self.assertNotIn((7, 14, 1), g.mst.graph[5])
+        self.assertEqual(g.query_min_power(7, 1), 12)
+        self.assertEqual(g.query_min_power(3, 10), 4)
+        g.remove_edge(1, 6) # (5, 7, 14) joins the two parts again
+        self.assertIn((7, 14, 1), g.mst.graph[5])
+        self.assertEqual(g.query_min_power(1, 7), 14)
+        g.update_power(5, 7, 1)
+        self.assertEqual(g.query_min_power(1, 7), 11)
+        self.assertRaises(ValueError, g.remove_edge, 1, 7)
+
+    def test_incremental_random(self):
+        rng = random.Random(0)
+        g = Graph(list(range(1, 16)))
+        for _ in range(30):
+            g.add_edge(rng.randint(1, 15), rng.randint(1, 15), rng.randint(1, 10))
+        g.maintain_mst()
+        for _ in range(100):
+            edges = [(a, b, power) for a in g.graph for b, power, _ in g.graph[a] if a <= b]
+            if rng.random() < 0.5 or not edges:
+                g.add_edge(rng.randint(1, 15), rng.randint(1, 15), rng.randint(1, 10))
+            else:
+                a, b, power = rng.choice(edges)
+                g.remove_edge(a, b, power)
+            g_mst = kruskal(g)
+            self.assertEqual(g.mst.nb_edges, g_mst.nb_edges)
+            self.assertEqual(sum(power for a in g.mst.graph for _, power, _ in g.mst.graph[a]),
+                             sum(power for a in g_mst.graph for _, power, _ in g_mst.graph[a]))
+
+    def test_index_updates(self):
+        rng = random.Random(1)
+        n = 40
+        g = Graph(list(range(1, n+1)))
+        for _ in range(80):
+            g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, 50))
+        g.maintain_mst()
+        g.query_min_power(1, 2)
+        tree = g._power_tree
+        for _ in range(200):
+            edges = [(a, b, power) for a in g.graph for b, power, _ in g.graph[a] if a <= b]
+            if rng.random() < 0.5 or not edges:
+                g.add_edge(rng.randint(1, n), rng.randint(1, n), rng.randint(1, 50))
+            else:
+                a, b, power = rng.choice(edges)
+                g.remove_edge(a, b, power)
+            self.assertIs(g._power_tree, tree) # updated in place, never built again
+            expected = MinPowerTree(g.mst)
+            for _ in range(5):
+                src, dest = rng.randint(1, n), rng.randint(1, n)
+                if expected.root[src] != expected.root[dest]:
+                    self.assertRaises(ValueError, g.query_min_power, src, dest)
+                else:
+                    self.assertEqual(g.query_min_power(src, dest), expected.query(src, dest))
+
+    def test_index_float_powers(self):
+        g = Graph([1, 2, 3, 4])
+        for node1, node2, power in [(1, 2, 5), (2, 3, 7), (3, 4, 9), (1, 4, 20)]:
+            g.add_edge(node1, node2, power)
+        g.maintain_mst()
+        g.query_min_power(1, 4) # the tables are built from integer powers
+        g.update_power(3, 4, 2.5)
+        self.assertEqual(g.query_min_power(3, 4), 2.5)
+        self.assertEqual(g.query_min_power(1, 4), 7)
+        g.add_edge(1, 3, 6.5)
+        self.assertEqual(g.query_min_power(1, 3), 6.5)
+        self.assertEqual(g.query_min_power(2, 4), 6.5)
+
+    def test_index_untouched(self):
+        g = graph_from_file("input/network.00.in")
+        g.maintain_mst()
+        g.query_min_power(1, 4)
+        tree, up = g._power_tree, [level.copy() for level in g._power_tree.up]
+        g.add_edge(1, 4, 20) # heavier than the path 1-2-3-4 : the tree does not change
+        g.remove_edge(1, 4, 20) # not an edge of the tree
+        self.assertIs(g._power_tree, tree)
+        self.assertTrue(all((a == b).all() for a, b in zip(up, tree.up)))
+        g.add_edge(9, 10, 1) # replaces (8, 9, 14) : only the part of 9 is hung again from 10
+        self.assertIs(g._power_tree, tree)
+        moved = [node for node in range(1, 11) if tree.up[0][node] != up[0][node]]
+        self.assertEqual(moved, [9])
+        self.assertEqual(g.query_min_power(8, 9), 11) # 8-1-2-3-4-10-9
+
 if __name__ == '__main__':
     unittest.main()
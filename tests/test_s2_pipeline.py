@@ -0,0 +1,28 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import tempfile
+import warnings
+from graph import graph_from_file, route_from_file, kruskal, MinPowerTree
+from pipeline import solve_routes
+import unittest   # The test framework
+
+class Test_Pipeline(unittest.TestCase):
+    def test_network1(self):
+        tree = MinPowerTree(kruskal(graph_from_file("input/network.1.in")))
+        expected = list(tree.query_many(route_from_file("input/routes.1.in")))
+        folder = tempfile.mkdtemp()
+        for workers in [1, 2]:
+            output = os.path.join(folder, "routes.1.{}.out".format(workers))
+            with warnings.catch_warnings(): # python >= 3.12 warns when a process with threads is forked
+                warnings.simplefilter("error", DeprecationWarning)
+                self.assertEqual(solve_routes("input/network.1.in", "input/routes.1.in", output, workers, chunk_size=30), 140)
+            with open(output, "r") as file:
+                self.assertEqual([int(line) for line in file], expected)
+            os.remove(output)
+        os.rmdir(folder)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import numpy as np
+from graph import graph_from_file, PowerThresholdIndex
+import unittest   # The test framework
+
+class Test_PowerThresholdIndex(unittest.TestCase):
+    def test_network00(self):
+        index = PowerThresholdIndex(graph_from_file("input/network.00.in"))
+        self.assertTrue(index.can_travel(1, 4, 11))
+        self.assertFalse(index.can_travel(1, 4, 10))
+        self.assertTrue(index.can_travel(2, 4, 10))
+        self.assertEqual(sorted(index.component_nodes(index.component_at_power(3, 4))), [3, 4, 10])
+        self.assertEqual(index.component_nodes(index.component_at_power(6, 11)), [6])
+
+    def test_network01(self):
+        index = PowerThresholdIndex(graph_from_file("input/network.01.in"))
+        self.assertFalse(index.can_travel(1, 4, 100))
+        self.assertEqual(sorted(index.component_nodes(index.component_at_power(7, 1))), [4, 5, 6, 7])
+
+    def test_vectorized(self):
+        index = PowerThresholdIndex(graph_from_file("input/network.00.in"))
+        src, dest, powers = np.array([1, 2]), np.array([4, 4]), np.array([4, 10, 11])
+        matrix = index.can_travel(src[:, None], dest[:, None], powers[None, :])
+        self.assertEqual(matrix.tolist(), [[False, False, True], [False, True, True]])
+
+if __name__ == '__main__':
+    unittest.main()
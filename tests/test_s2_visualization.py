@@ -0,0 +1,49 @@
+# This will work if ran from the root folder.
+import sys
+sys.path.append("delivery_network")
+
+import os
+import shutil
+import tempfile
+from graph import Graph, graph_from_file
+from visualization import write_dot, neighborhood, view_route, view_mst
+import unittest   # The test framework
+
+class Test_Visualization(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def read_edges(self, filename):
+        with open(filename, "r") as file:
+            return [line for line in file if " -- " in line]
+
+    def test_write_dot(self):
+        g = graph_from_file("input/network.00.in")
+        path = g.min_power(1, 4)[0]
+        edges = self.read_edges(write_dot(g, os.path.join(self.folder, "g.gv"), path=path))
+        self.assertEqual(len(edges), g.nb_edges) # each edge once
+        self.assertEqual(sum("color=red" in edge for edge in edges), len(path) - 1)
+        self.assertIn('\t"1" -- "2" [label="weight = 11\\n length = 1" color=red weight=11]\n', edges)
+
+    def test_loops_and_parallel_edges(self):
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 5)
+        g.add_edge(2, 1, 7)
+        g.add_edge(3, 3, 1)
+        self.assertEqual(len(self.read_edges(write_dot(g, os.path.join(self.folder, "g.gv")))), 3)
+        self.assertEqual(len(self.read_edges(write_dot(g, os.path.join(self.folder, "g.gv"), nodes=[1, 3]))), 1)
+
+    def test_subgraphs(self):
+        g = graph_from_file("input/network.00.in")
+        self.assertEqual(neighborhood(g, [4], 1), {3, 4, 10})
+        self.assertEqual(neighborhood(g, [4], 0), {4})
+        filename = view_route(g, 3, 10, k=1, filename=os.path.join(self.folder, "route.gv"), show=False)
+        self.assertEqual(len(self.read_edges(filename)), 3) # 2-3, 3-4, 4-10
+        filename = view_mst(g, [9, 6], filename=os.path.join(self.folder, "mst.gv"), show=False)
+        self.assertEqual(len(self.read_edges(filename)), 3) # the tree path 9-8-1-6
+
+if __name__ == '__main__':
+    unittest.main()
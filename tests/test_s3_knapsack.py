@@ -0,0 +1,70 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import random
+import time
+import tracemalloc
+from graph import knapsack, knapsack_dp
+import unittest   # The test framework
+
+class Test_Knapsack(unittest.TestCase):
+    def test_small(self):
+        items = [[10, 60], [20, 100], [30, 120]] # cost, utility
+        self.assertEqual(knapsack(50, items), (220, [1, 2], 0))
+        self.assertEqual(knapsack(0, items), (0, [], 0))
+
+    def test_greedy_is_not_optimal(self):
+        items = [[6, 30], [5, 20], [5, 20]]
+        self.assertEqual(knapsack(10, items), (40, [1, 2], 0))
+
+    def test_node_budget(self):
+        items = [[3 + i % 7, 10 + (i * 37) % 23] for i in range(200)]
+        max_profit, chosen, gap = knapsack(100, items, max_nodes=1)
+        self.assertEqual(sum(items[i][1] for i in chosen), max_profit)
+        self.assertLessEqual(sum(items[i][0] for i in chosen), 100)
+        self.assertGreaterEqual(gap, 0)
+        self.assertEqual(knapsack(100, items)[2], 0)
+
+    def test_dp(self):
+        items = [[10, 60], [20, 100], [30, 120]]
+        self.assertEqual(knapsack_dp(50, items, epsilon=0.01), (220, [1, 2], 20.0))
+        self.assertEqual(knapsack_dp(100, items), (280, [0, 1, 2], 0)) # everything fits
+        items = [[3 + i % 7, 10 + (i * 37) % 23] for i in range(200)]
+        max_profit, chosen, gap = knapsack_dp(100, items, epsilon=0.1)
+        self.assertEqual(sum(items[i][1] for i in chosen), max_profit)
+        self.assertGreaterEqual(max_profit + gap, knapsack(100, items)[0]) # the gap bounds the optimum
+        self.assertLessEqual(sum(items[i][0] for i in chosen), 100)
+        self.assertGreaterEqual(max_profit, 0.9 * knapsack(100, items)[0]) # at least (1-epsilon) * the optimum
+
+    def test_dp_large(self):
+        rng = random.Random(0)
+        items = [[rng.randint(10**4, 10**6), rng.randint(1, 10**4)] for _ in range(100000)]
+        items += [[rng.randint(10**6, 10**7), rng.randint(10**6, 10**7)] for _ in range(1000)] # large items
+        budget = 3*(10**8) # only a few thousand routes fit
+        start = time.perf_counter()
+        max_profit, chosen, gap = knapsack_dp(budget, items, epsilon=0.05)
+        self.assertLess(time.perf_counter() - start, 10)
+        tracemalloc.start()
+        knapsack_dp(budget, items, epsilon=0.01)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peak, 100 * 10**6) # bytes : O(n + 1/epsilon^2), no table per item
+        self.assertEqual(sum(items[i][1] for i in chosen), max_profit)
+        self.assertLessEqual(sum(items[i][0] for i in chosen), budget)
+        order = sorted(items, key=lambda item: item[1] / item[0], reverse=True)
+        upper, left = 0, budget # fractional bound of the optimum
+        for cost, profit in order:
+            upper += profit * min(1, left / cost)
+            left -= min(left, cost)
+        self.assertGreaterEqual(max_profit, 0.95 * upper)
+        self.assertGreaterEqual(max_profit + gap, upper)
+
+    def test_dp_epsilon(self):
+        items = [[10, 60], [20, 100], [30, 120]]
+        for epsilon in [0, -0.1, 1, 3.5]:
+            with self.assertRaises(ValueError):
+                knapsack_dp(50, items, epsilon=epsilon)
+
+if __name__ == '__main__':
+    unittest.main()
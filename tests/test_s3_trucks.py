@@ -0,0 +1,66 @@
+# This will work if ran from the root folder.
+import sys 
+sys.path.append("delivery_network")
+
+import os
+import shutil
+import tempfile
+from graph import Graph, truck_from_file, TruckCatalogue, greedy_knapsack, wrapper
+import unittest   # The test framework
+
+class Test_TruckCatalogue(unittest.TestCase):
+    def test_frontier(self):
+        catalogue = TruckCatalogue([[10, 5], [20, 4], [15, 9], [30, 12], [30, 11], [5, 1]])
+        self.assertEqual(catalogue.trucks, [[5, 1], [20, 4], [30, 11]])
+        self.assertEqual(catalogue.cheapest_truck_for(0), [5, 1])
+        self.assertEqual(catalogue.cheapest_truck_for(12), [20, 4])
+        self.assertEqual(catalogue.cheapest_truck_for(30), [30, 11])
+        self.assertEqual(catalogue.cheapest_truck_for(31), None)
+        self.assertEqual(catalogue.cheapest_trucks_for([0, 12, 20, 31]).tolist(), [0, 1, 1, -1])
+
+    def test_trucks2(self):
+        trucks = truck_from_file("input/trucks.2.in")
+        catalogue = TruckCatalogue(trucks)
+        for power in [0, 1000, 123456, 10**6, 10**9]:
+            feasible = [truck[1] for truck in trucks if truck[0] >= power]
+            truck = catalogue.cheapest_truck_for(power)
+            self.assertEqual(truck[1] if truck else None, min(feasible) if feasible else None)
+
+    def test_greedy_knapsack(self):
+        trucks = [[10, 5], [20, 8], [20, 30], [5, 1]]
+        min_powers = [(1, 2, 100, 20), (3, 4, 50, 0), (5, 6, 60, 20), (7, 8, 10, 30)]
+        truck_assignments, total_profit = greedy_knapsack(trucks, min_powers, budget=20)
+        self.assertEqual(truck_assignments, [([5, 1], (3, 4)), ([20, 8], (1, 2))])
+        self.assertEqual(total_profit, 150)
+        truck_assignments, total_profit = greedy_knapsack(trucks, min_powers, budget=100)
+        self.assertEqual(total_profit, 210)
+
+    def test_wrapper_indices(self):
+        g = Graph([1, 2, 3])
+        g.add_edge(1, 2, 30)
+        g.add_edge(2, 3, 5)
+        g.add_edge(1, 3, 6)
+        folder = tempfile.mkdtemp()
+        try:
+            routes, trucks = os.path.join(folder, "routes.in"), os.path.join(folder, "trucks.in")
+            with open(routes, "w") as file:
+                file.write("3\n1 2 50\n1 3 40\n2 3 30\n")
+            with open(trucks, "w") as file:
+                file.write("1\n5 10\n")
+            # only the route (2, 3) can be travelled : its index is the one of the file
+            self.assertEqual(wrapper(g, routes, trucks), (30, [2], 0))
+            self.assertEqual(wrapper(g, routes, trucks, method="dp"), (30, [2], 0))
+            self.assertEqual(wrapper(g, routes, trucks, budget=9), (0, [], 0)) # the truck costs 10
+            with open(trucks, "w") as file:
+                file.write("2\n5 10\n6 15\n")
+            self.assertEqual(wrapper(g, routes, trucks, budget=30), (90, [0, 1], 0))
+            # the search stops after the greedy solution : the gap bounds what is left
+            profit, chosen, gap = wrapper(g, routes, trucks, budget=30, max_nodes=1)
+            self.assertEqual((profit, chosen), (80, [0, 2]))
+            self.assertGreaterEqual(profit + gap, 90)
+            self.assertEqual(wrapper(g, routes, trucks, budget=30, max_time=0)[:2], (80, [0, 2]))
+        finally:
+            shutil.rmtree(folder)
+
+if __name__ == '__main__':
+    unittest.main()